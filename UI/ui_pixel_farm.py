@@ -9,7 +9,6 @@ import sys
 import threading
 import time
 import tkinter as tk
-from copy import deepcopy
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -29,10 +28,13 @@ try:
     from src.algorithms.solver_mrv_lcv import MRVLCVSolver
     from src.algorithms.solver_ac3_mrv_lcv import AC3_MRV_LCV_Solver
     from src.generator.sudoku_generator import SudokuGenerator
+    from src.generator.puzzle_source import get_puzzle_library, get_puzzle_pool, warm_up_pool
+    from src.algorithms.solution_cache import cached
     print("🌱 算法和生成器加载成功!")
 except ImportError as e:
     print(f"⚠ 警告：导入失败 - {e}")
-    BasicSolver = MRVLCVSolver = AC3_MRV_LCV_Solver = SudokuGenerator = None
+    BasicSolver = MRVLCVSolver = AC3_MRV_LCV_Solver = SudokuGenerator = cached = None
+    get_puzzle_library = get_puzzle_pool = warm_up_pool = None
 
 # ==================== 像素农场配色方案 ====================
 THEME = {
@@ -832,12 +834,23 @@ def fill_with_difficulty():
                     entry.config(state="normal")
                     entry.delete(0, tk.END)
             
-            generator = SudokuGenerator()
-            puzzle, info = generator.generate_puzzle_with_difficulty(
-                target_difficulty=target_difficulty,
-                symmetric=True,
-                max_retries=20
-            )
+            # 优先从题目池取题（毫秒级），池为空时从题目库随机取一道，都没有再现场生成
+            puzzle_pool, puzzle_library = get_puzzle_pool(), get_puzzle_library()
+            pooled = puzzle_pool.take(target_difficulty) if puzzle_pool else None
+            if pooled is None and puzzle_library is not None:
+                record = puzzle_library.random_puzzle(target_difficulty)
+                pooled = (record.board, record.info) if record else None
+            if pooled is not None:
+                puzzle, info = pooled
+            else:
+                generator = SudokuGenerator()
+                puzzle, info = generator.generate_puzzle_with_difficulty(
+                    target_difficulty=target_difficulty,
+                    symmetric=True,
+                    max_retries=20
+                )
+                if puzzle_library is not None:
+                    puzzle_library.add(puzzle, info)
             
             global original_puzzle
             for r in range(9):
@@ -974,12 +987,12 @@ def solve_sudoku():
     
     def run_solver():
         try:
-            puzzle = deepcopy(sudoku_data)
+            puzzle = [row[:] for row in sudoku_data]
             
             if selected_alg == "基础DFS算法":
                 if BasicSolver is None:
                     raise ImportError("基础工具未加载")
-                solver = BasicSolver()
+                solver = cached(BasicSolver())
                 solver.set_animation_callbacks(
                     fill_cb=animation_fill_cell,
                     backtrack_cb=animation_backtrack_cell)
@@ -988,7 +1001,7 @@ def solve_sudoku():
             elif selected_alg == "MRV+LCV算法":
                 if MRVLCVSolver is None:
                     raise ImportError("MRV+LCV工具未加载")
-                solver = MRVLCVSolver()
+                solver = cached(MRVLCVSolver())
                 solver.set_animation_callbacks(
                     fill_cb=animation_fill_cell,
                     backtrack_cb=animation_backtrack_cell)
@@ -997,7 +1010,7 @@ def solve_sudoku():
             elif selected_alg == "AC3+MRV+LCV算法":
                 if AC3_MRV_LCV_Solver is None:
                     raise ImportError("AC3+MRV+LCV工具未加载")
-                solver = AC3_MRV_LCV_Solver()
+                solver = cached(AC3_MRV_LCV_Solver())
                 solver.set_animation_callbacks(
                     fill_cb=animation_fill_cell,
                     backtrack_cb=animation_backtrack_cell,
@@ -1061,8 +1074,8 @@ def compare_algorithms():
     def run_comparison():
         try:
             if BasicSolver:
-                puzzle = deepcopy(sudoku_data)
-                solver = BasicSolver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(BasicSolver())
                 solver.solve(puzzle)
                 actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
                 performance_data["基础DFS"]["time"] = actual_time
@@ -1070,8 +1083,8 @@ def compare_algorithms():
                 performance_data["基础DFS"]["backtracks"] = solver.stats.backtracks
             
             if MRVLCVSolver:
-                puzzle = deepcopy(sudoku_data)
-                solver = MRVLCVSolver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(MRVLCVSolver())
                 solver.solve(puzzle)
                 actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
                 performance_data["MRV+LCV"]["time"] = actual_time
@@ -1079,8 +1092,8 @@ def compare_algorithms():
                 performance_data["MRV+LCV"]["backtracks"] = solver.stats.backtracks
             
             if AC3_MRV_LCV_Solver:
-                puzzle = deepcopy(sudoku_data)
-                solver = AC3_MRV_LCV_Solver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(AC3_MRV_LCV_Solver())
                 solver.solve(puzzle)
                 actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
                 performance_data["AC3+MRV+LCV"]["time"] = actual_time
@@ -1252,4 +1265,6 @@ deco_text.pack(pady=5)
 if __name__ == "__main__":
     print("🌾 数独农场启动中... Sudoku Farm Loading...")
     print("🌻 欢迎来到数独农场! Welcome to Sudoku Farm!")
+    if warm_up_pool is not None:
+        warm_up_pool()
     root.mainloop()
@@ -9,7 +9,6 @@ import sys
 import threading
 import time
 import tkinter as tk
-from copy import deepcopy
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -28,11 +27,15 @@ try:
     from src.algorithms.solver_basic_v1 import SudokuSolver as BasicSolver
     from src.algorithms.solver_mrv_lcv import MRVLCVSolver
     from src.algorithms.solver_ac3_mrv_lcv import AC3_MRV_LCV_Solver
+    from src.algorithms.solver_dlx import DLXSolver
     from src.generator.sudoku_generator import SudokuGenerator
+    from src.generator.puzzle_source import get_puzzle_library, get_puzzle_pool, warm_up_pool
+    from src.algorithms.solution_cache import cached
     print("✓ 算法和生成器加载成功")
 except ImportError as e:
     print(f"✗ 警告：导入失败 - {e}")
-    BasicSolver = MRVLCVSolver = AC3_MRV_LCV_Solver = SudokuGenerator = None
+    BasicSolver = MRVLCVSolver = AC3_MRV_LCV_Solver = DLXSolver = SudokuGenerator = cached = None
+    get_puzzle_library = get_puzzle_pool = warm_up_pool = None
 
 # ==================== 高级配色方案 ====================
 THEME = {
@@ -154,7 +157,7 @@ tk.Label(row1, text="算法：", bg=THEME["bg_card"],
     fg=THEME["text_primary"], font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(30, 5))
 algorithm_var = tk.StringVar(value="MRV+LCV算法")
 alg_menu = ttk.Combobox(row1, textvariable=algorithm_var,
-    values=["基础DFS算法", "MRV+LCV算法", "AC3+MRV+LCV算法"],
+    values=["基础DFS算法", "MRV+LCV算法", "AC3+MRV+LCV算法", "DLX精确覆盖算法"],
     state="readonly", width=20, style="Premium.TCombobox")
 alg_menu.pack(side=tk.LEFT, padx=10)
 
@@ -685,12 +688,23 @@ def fill_with_difficulty():
                     entry.delete(0, tk.END)
             
             # 生成数独
-            generator = SudokuGenerator()
-            puzzle, info = generator.generate_puzzle_with_difficulty(
-                target_difficulty=target_difficulty,
-                symmetric=True,
-                max_retries=20
-            )
+            # 优先从题目池取题（毫秒级），池为空时从题目库随机取一道，都没有再现场生成
+            puzzle_pool, puzzle_library = get_puzzle_pool(), get_puzzle_library()
+            pooled = puzzle_pool.take(target_difficulty) if puzzle_pool else None
+            if pooled is None and puzzle_library is not None:
+                record = puzzle_library.random_puzzle(target_difficulty)
+                pooled = (record.board, record.info) if record else None
+            if pooled is not None:
+                puzzle, info = pooled
+            else:
+                generator = SudokuGenerator()
+                puzzle, info = generator.generate_puzzle_with_difficulty(
+                    target_difficulty=target_difficulty,
+                    symmetric=True,
+                    max_retries=20
+                )
+                if puzzle_library is not None:
+                    puzzle_library.add(puzzle, info)
             
             # 保存原始题目
             global original_puzzle
@@ -850,12 +864,12 @@ def solve_sudoku():
     
     def run_solver():
         try:
-            puzzle = deepcopy(sudoku_data)
+            puzzle = [row[:] for row in sudoku_data]
             
             if selected_alg == "基础DFS算法":
                 if BasicSolver is None:
                     raise ImportError("基础DFS算法未加载")
-                solver = BasicSolver()
+                solver = cached(BasicSolver())
                 solver.set_animation_callbacks(
                     fill_cb=animation_fill_cell,
                     backtrack_cb=animation_backtrack_cell)
@@ -864,7 +878,7 @@ def solve_sudoku():
             elif selected_alg == "MRV+LCV算法":
                 if MRVLCVSolver is None:
                     raise ImportError("MRV+LCV算法未加载")
-                solver = MRVLCVSolver()
+                solver = cached(MRVLCVSolver())
                 solver.set_animation_callbacks(
                     fill_cb=animation_fill_cell,
                     backtrack_cb=animation_backtrack_cell)
@@ -873,12 +887,21 @@ def solve_sudoku():
             elif selected_alg == "AC3+MRV+LCV算法":
                 if AC3_MRV_LCV_Solver is None:
                     raise ImportError("AC3+MRV+LCV算法未加载")
-                solver = AC3_MRV_LCV_Solver()
+                solver = cached(AC3_MRV_LCV_Solver())
                 solver.set_animation_callbacks(
                     fill_cb=animation_fill_cell,
                     backtrack_cb=animation_backtrack_cell,
                     ac3_prune_cb=animation_ac3_prune_cell)
                 solution = solver.solve(puzzle)
+                
+            elif selected_alg == "DLX精确覆盖算法":
+                if DLXSolver is None:
+                    raise ImportError("DLX精确覆盖算法未加载")
+                solver = cached(DLXSolver())
+                solver.set_animation_callbacks(
+                    fill_cb=animation_fill_cell,
+                    backtrack_cb=animation_backtrack_cell)
+                solution = solver.solve(puzzle)
             else:
                 raise ValueError(f"未知算法: {selected_alg}")
             
@@ -923,6 +946,7 @@ performance_data = {
     "基础DFS": {"time": 0, "nodes": 0, "backtracks": 0},
     "MRV+LCV": {"time": 0, "nodes": 0, "backtracks": 0},
     "AC3+MRV+LCV": {"time": 0, "nodes": 0, "backtracks": 0},
+    "DLX": {"time": 0, "nodes": 0, "backtracks": 0},
 }
 
 def compare_algorithms():
@@ -940,8 +964,8 @@ def compare_algorithms():
         try:
             # 测试基础DFS（对比时不使用动画，获取真实性能）
             if BasicSolver:
-                puzzle = deepcopy(sudoku_data)
-                solver = BasicSolver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(BasicSolver())
                 solver.solve(puzzle)
                 actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
                 performance_data["基础DFS"]["time"] = actual_time
@@ -950,8 +974,8 @@ def compare_algorithms():
             
             # 测试MRV+LCV
             if MRVLCVSolver:
-                puzzle = deepcopy(sudoku_data)
-                solver = MRVLCVSolver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(MRVLCVSolver())
                 solver.solve(puzzle)
                 actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
                 performance_data["MRV+LCV"]["time"] = actual_time
@@ -960,14 +984,24 @@ def compare_algorithms():
             
             # 测试AC3+MRV+LCV
             if AC3_MRV_LCV_Solver:
-                puzzle = deepcopy(sudoku_data)
-                solver = AC3_MRV_LCV_Solver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(AC3_MRV_LCV_Solver())
                 solver.solve(puzzle)
                 actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
                 performance_data["AC3+MRV+LCV"]["time"] = actual_time
                 performance_data["AC3+MRV+LCV"]["nodes"] = solver.stats.nodes
                 performance_data["AC3+MRV+LCV"]["backtracks"] = solver.stats.backtracks
             
+            # 测试DLX
+            if DLXSolver:
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(DLXSolver())
+                solver.solve(puzzle)
+                actual_time = solver.stats.pure_solve_time if hasattr(solver.stats, 'pure_solve_time') else solver.stats.solve_time
+                performance_data["DLX"]["time"] = actual_time
+                performance_data["DLX"]["nodes"] = solver.stats.nodes
+                performance_data["DLX"]["backtracks"] = solver.stats.backtracks
+            
             # 显示图表
             root.after(0, lambda: [
                 show_chart(),
@@ -995,7 +1029,7 @@ def show_chart():
     chart_window.geometry("1000x700")
     chart_window.configure(bg=THEME["bg_dark"])
     
-    algorithms = ["基础DFS", "MRV+LCV", "AC3+MRV+LCV"]
+    algorithms = ["基础DFS", "MRV+LCV", "AC3+MRV+LCV", "DLX"]
     times = [performance_data[alg]["time"] for alg in algorithms]
     nodes = [performance_data[alg]["nodes"] for alg in algorithms]
     backtracks = [performance_data[alg]["backtracks"] for alg in algorithms]
@@ -1004,7 +1038,7 @@ def show_chart():
     fig.patch.set_facecolor(THEME["bg_dark"])
     
     # 图表1：执行时间对比
-    colors1 = [THEME["primary"], THEME["secondary"], THEME["accent"]]
+    colors1 = [THEME["primary"], THEME["secondary"], THEME["accent"], THEME["info"]]
     bars1 = ax1.bar(algorithms, times, color=colors1, alpha=0.8, edgecolor='white', linewidth=2)
     ax1.set_ylabel('执行时间 (秒)', fontsize=12, color='white')
     ax1.set_title('执行时间对比', fontsize=14, fontweight='bold', color=THEME["text_accent"])
@@ -1044,4 +1078,6 @@ def show_chart():
 # ==================== 启动应用 ====================
 if __name__ == "__main__":
     print("🎮 数独求解器 Premium Edition 启动中...")
+    if warm_up_pool is not None:
+        warm_up_pool()
     root.mainloop()
@@ -4,7 +4,6 @@ import sys
 import threading
 import time
 import tkinter as tk
-from copy import deepcopy
 from tkinter import ttk, messagebox
 
 import matplotlib.pyplot as plt
@@ -24,6 +23,8 @@ try:
     from src.algorithms.solver_mrv_lcv import MRVLCVSolver
     from src.algorithms.solver_ac3_mrv_lcv import AC3_MRV_LCV_Solver
     from src.generator.sudoku_generator import SudokuGenerator
+    from src.generator.puzzle_source import get_puzzle_library, get_puzzle_pool, warm_up_pool
+    from src.algorithms.solution_cache import cached
 
     print("✓ 算法和生成器加载成功")
 except ImportError as e:
@@ -32,6 +33,8 @@ except ImportError as e:
     MRVLCVSolver = None
     AC3_MRV_LCV_Solver = None
     SudokuGenerator = None
+    get_puzzle_library = get_puzzle_pool = warm_up_pool = None
+    cached = None
 
 # ---------------------- 1. 初始化主窗口 + 全局样式配置（核心修复）----------------------
 root = tk.Tk()
@@ -588,12 +591,23 @@ def fill_with_difficulty():
         perf_labels['status'].config(text=f"正在生成{level}数独...", foreground="#ff9900")
 
         try:
-            generator = SudokuGenerator()
-            puzzle, info = generator.generate_puzzle_with_difficulty(
-                target_difficulty=target_difficulty,
-                symmetric=True,
-                max_retries=20
-            )
+            # 优先从题目池取题（毫秒级），池为空时从题目库随机取一道，都没有再现场生成
+            puzzle_pool, puzzle_library = get_puzzle_pool(), get_puzzle_library()
+            pooled = puzzle_pool.take(target_difficulty) if puzzle_pool else None
+            if pooled is None and puzzle_library is not None:
+                record = puzzle_library.random_puzzle(target_difficulty)
+                pooled = (record.board, record.info) if record else None
+            if pooled is not None:
+                puzzle, info = pooled
+            else:
+                generator = SudokuGenerator()
+                puzzle, info = generator.generate_puzzle_with_difficulty(
+                    target_difficulty=target_difficulty,
+                    symmetric=True,
+                    max_retries=20
+                )
+                if puzzle_library is not None:
+                    puzzle_library.add(puzzle, info)
             root.after(0, lambda: fill_sudoku(puzzle))
             root.after(0, lambda: perf_labels['status'].config(
                 text=f"已生成 {info['level']} 难度（提示数:{info['clues']}）",
@@ -668,12 +682,12 @@ def solve_sudoku():
     def run_solver():
         try:
             start_time = time.time()
-            puzzle = deepcopy(sudoku_data)
+            puzzle = [row[:] for row in sudoku_data]
 
             if selected_alg == "基础DFS算法":
                 if BasicSolver is None:
                     raise ImportError("基础DFS算法未加载")
-                solver = BasicSolver()
+                solver = cached(BasicSolver())
                 solution = solver.solve(puzzle)
                 final_perf = {
                     'algorithm': selected_alg,
@@ -687,7 +701,7 @@ def solve_sudoku():
             elif selected_alg == "MRV+LCV算法":
                 if MRVLCVSolver is None:
                     raise ImportError("MRV+LCV算法未加载")
-                solver = MRVLCVSolver()
+                solver = cached(MRVLCVSolver())
                 solution = solver.solve(puzzle)
                 final_perf = {
                     'algorithm': selected_alg,
@@ -701,7 +715,7 @@ def solve_sudoku():
             elif selected_alg == "AC3+MRV+LCV算法":
                 if AC3_MRV_LCV_Solver is None:
                     raise ImportError("AC3+MRV+LCV算法未加载")
-                solver = AC3_MRV_LCV_Solver()
+                solver = cached(AC3_MRV_LCV_Solver())
                 solution = solver.solve(puzzle)
                 final_perf = {
                     'algorithm': selected_alg,
@@ -760,8 +774,8 @@ def compare_algorithms():
 
             # 测试基础DFS算法
             if BasicSolver:
-                puzzle = deepcopy(sudoku_data)
-                solver = BasicSolver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(BasicSolver())
                 solution = solver.solve(puzzle)
                 # 保存性能数据
                 performance_data["基础DFS"]["time"] = solver.stats.solve_time
@@ -777,8 +791,8 @@ def compare_algorithms():
 
             # 测试MRV+LCV算法
             if MRVLCVSolver:
-                puzzle = deepcopy(sudoku_data)
-                solver = MRVLCVSolver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(MRVLCVSolver())
                 solution = solver.solve(puzzle)
                 # 保存性能数据
                 performance_data["MRV+LCV"]["time"] = solver.stats.solve_time
@@ -794,8 +808,8 @@ def compare_algorithms():
 
             # 测试AC3+MRV+LCV算法
             if AC3_MRV_LCV_Solver:
-                puzzle = deepcopy(sudoku_data)
-                solver = AC3_MRV_LCV_Solver()
+                puzzle = [row[:] for row in sudoku_data]
+                solver = cached(AC3_MRV_LCV_Solver())
                 solution = solver.solve(puzzle)
                 # 保存性能数据
                 performance_data["AC3+MRV+LCV"]["time"] = solver.stats.solve_time
@@ -995,4 +1009,7 @@ def save_chart_image(fig):
 
 
 # ---------------------- 启动主循环 ----------------------
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    if warm_up_pool is not None:
+        warm_up_pool()
+    root.mainloop()
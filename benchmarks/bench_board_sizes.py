@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+不同盘面大小（4x4 / 9x9 / 16x16 / 25x25）下各求解算法的性能对比。
+
+用法（在项目根目录）：
+    python benchmarks/bench_board_sizes.py [--puzzles 5] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# 导入路径配置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithms.solver_basic_v1 import SudokuSolver as BasicSolver
+from src.algorithms.solver_mrv_lcv import MRVLCVSolver
+from src.algorithms.solver_ac3_mrv_lcv import AC3_MRV_LCV_Solver
+from src.algorithms.solver_dlx import DLXSolver
+
+BOX_SIZES = [2, 3, 4, 5]
+# 挖空比例：盘面越大保留越多提示数，保证每道题都能在合理时间内求解
+HOLE_RATIO = {2: 0.6, 3: 0.55, 4: 0.45, 5: 0.35}
+ALGORITHMS = [
+    ("基础DFS", BasicSolver),
+    ("MRV+LCV", MRVLCVSolver),
+    ("AC3+MRV+LCV", AC3_MRV_LCV_Solver),
+    ("DLX", DLXSolver),
+]
+
+
+def make_puzzle(box_size, hole_ratio, rng):
+    """由规则终盘随机打乱行/列/数字后挖空，得到 N×N 测试题。"""
+    n = box_size * box_size
+    groups = list(range(box_size))
+    rows = [g * box_size + r for g in rng.sample(groups, box_size) for r in rng.sample(groups, box_size)]
+    cols = [g * box_size + c for g in rng.sample(groups, box_size) for c in rng.sample(groups, box_size)]
+    digits = rng.sample(range(1, n + 1), n)
+
+    def pattern(r, c):
+        return (box_size * (r % box_size) + r // box_size + c) % n
+
+    board = [[digits[pattern(r, c)] for c in cols] for r in rows]
+    for i in rng.sample(range(n * n), int(n * n * hole_ratio)):
+        board[i // n][i % n] = 0
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="不同盘面大小的求解性能对比")
+    parser.add_argument("--puzzles", type=int, default=5, help="每种尺寸的题目数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'尺寸':<8}{'算法':<14}{'平均时间(s)':>12}{'平均节点':>12}{'平均回溯':>12}")
+    print("-" * 58)
+    for box_size in BOX_SIZES:
+        n = box_size * box_size
+        puzzles = [make_puzzle(box_size, HOLE_RATIO[box_size], rng) for _ in range(args.puzzles)]
+        for name, solver_cls in ALGORITHMS:
+            total_time = total_nodes = total_backtracks = 0
+            for puzzle in puzzles:
+                solver = solver_cls(box_size=box_size)
+                start = time.perf_counter()
+                solution = solver.solve([row[:] for row in puzzle])
+                total_time += time.perf_counter() - start
+                total_nodes += solver.stats.nodes
+                total_backtracks += solver.stats.backtracks
+                if solution is None:
+                    print(f"  ✗ {name} 未能求解 {n}x{n} 题目")
+            k = len(puzzles)
+            print(f"{f'{n}x{n}':<8}{name:<14}{total_time / k:>12.4f}"
+                  f"{total_nodes / k:>12.1f}{total_backtracks / k:>12.1f}")
+        print("-" * 58)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+文本题库与二进制题库的读取 / 求解性能对比。
+
+同一组题目分别保存为 81 字符文本和 41 字节二进制格式，比较：
+- 读取：逐行解析文本 / 逐条解码二进制 / NumPy 整块解码二进制
+- 求解：solve_many（逐题）与 solve_lockstep（齐步，需要 numpy）分别读取两种格式
+
+未给出题库文件时，用样题的随机等价变换生成 --puzzles 道题。
+
+用法（在项目根目录）：
+    python benchmarks/bench_corpus.py [--puzzles 20000] [--algorithm dlx] [--seed 0]
+    python benchmarks/bench_corpus.py --corpus puzzles.txt
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 导入路径配置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithms.batch_solver import SOLVER_FACTORIES, solve_many
+from src.formats.binary_format import BinaryCorpus, is_binary_corpus, write_corpus
+from src.formats.text_format import format_board, iter_puzzles, parse_puzzle
+from src.generator.transforms import random_isomorph
+
+SAMPLES = [
+    "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79",
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [board for _, board in iter_puzzles(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文本 / 二进制题库的读取与求解性能对比")
+    parser.add_argument("--corpus", help="题库文件（文本或二进制）；省略时随机生成")
+    parser.add_argument("--puzzles", type=int, default=20000, help="随机生成的题目数量")
+    parser.add_argument("--algorithm", default="dlx", choices=sorted(SOLVER_FACTORIES), help="求解算法")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    if args.corpus is None:
+        rng = random.Random(args.seed)
+        boards = [random_isomorph(parse_puzzle(rng.choice(SAMPLES)), rng) for _ in range(args.puzzles)]
+    elif is_binary_corpus(args.corpus):
+        with BinaryCorpus(args.corpus) as corpus:
+            boards = [board.to_rows() for board in corpus]
+    else:
+        boards = read_text(args.corpus)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "corpus.txt")
+        binary_path = os.path.join(tmp, "corpus.bin")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.writelines(format_board(board) + "\n" for board in boards)
+        write_corpus(binary_path, boards)
+        count = len(boards)
+        print(f"题目数: {count}，文本 {os.path.getsize(text_path)} 字节，"
+              f"二进制 {os.path.getsize(binary_path)} 字节")
+
+        corpus = BinaryCorpus(binary_path)
+        rows = [
+            ("读取: 文本逐行解析", timed(lambda: read_text(text_path))[0]),
+            ("读取: 二进制逐条解码", timed(lambda: list(corpus))[0]),
+        ]
+        try:
+            from src.algorithms.lockstep_solver import solve_lockstep
+        except ImportError:
+            solve_lockstep = None
+        if solve_lockstep is not None:
+            rows.append(("读取: 二进制 NumPy 整块", timed(corpus.boards_array)[0]))
+
+        def solve_all(puzzles):
+            return list(solve_many(puzzles, algorithm=args.algorithm, workers=1))
+
+        rows.append((f"求解: 文本 + {args.algorithm}", timed(lambda: solve_all(read_text(text_path)))[0]))
+        rows.append((f"求解: 二进制 + {args.algorithm}", timed(lambda: solve_all(corpus))[0]))
+        if solve_lockstep is not None:
+            rows.append(("求解: 文本 + 齐步",
+                         timed(lambda: list(solve_lockstep(read_text(text_path), args.algorithm)))[0]))
+            rows.append(("求解: 二进制 + 齐步", timed(lambda: list(solve_lockstep(corpus, args.algorithm)))[0]))
+        corpus.close()
+
+    print(f"{'步骤':<24}{'总时间(s)':>12}{'每题(us)':>12}")
+    print("-" * 48)
+    for name, total in rows:
+        print(f"{name:<24}{total:>12.3f}{total / max(count, 1) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
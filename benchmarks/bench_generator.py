@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+生成器唯一性判断的性能对比：
+原始逐格 DFS 计数 / 位掩码 + MRV 计数器 / 利用已知终盘的增量判断。
+
+三种方式使用同一个随机种子，判断结果一致，因此生成的题目完全相同，
+只比较生成 Hard 难度题目的耗时。
+
+用法（在项目根目录）：
+    python benchmarks/bench_generator.py [--puzzles 2] [--retries 5] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+# 导入路径配置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.generator.sudoku_generator import SudokuGenerator
+
+
+class LegacyGenerator(SudokuGenerator):
+    """唯一性判断改回原始的逐格 DFS 计数。"""
+
+    def __init__(self, seed=None):
+        super().__init__(seed=seed, incremental=False, verbose=False)
+
+    def has_unique_solution(self, board, solution_limit=2):
+        return self._count_solutions([row[:] for row in board], limit=solution_limit) == 1
+
+
+def run(make_generator, args):
+    """用给定的生成器生成 args.puzzles 道 Hard 题，返回 (总耗时, 题目列表)。"""
+    generator = make_generator(args.seed)
+    puzzles = []
+    start = time.perf_counter()
+    for _ in range(args.puzzles):
+        puzzle, _ = generator.generate_puzzle_with_difficulty("Hard", max_retries=args.retries)
+        puzzles.append(puzzle)
+    return time.perf_counter() - start, puzzles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成器唯一性判断的性能对比")
+    parser.add_argument("--puzzles", type=int, default=2, help="生成的 Hard 题目数量")
+    parser.add_argument("--retries", type=int, default=5, help="每道题的最大尝试次数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    modes = [
+        ("逐格 DFS", LegacyGenerator),
+        ("位掩码 + MRV", lambda seed: SudokuGenerator(seed=seed, incremental=False, verbose=False)),
+        ("增量判断", lambda seed: SudokuGenerator(seed=seed, incremental=True, verbose=False)),
+    ]
+    results = [(name, *run(make_generator, args)) for name, make_generator in modes]
+
+    legacy_time = results[0][1]
+    print(f"{'唯一性判断':<16}{'总时间(s)':>12}{'每题(s)':>12}{'加速比':>10}")
+    print("-" * 50)
+    for name, total, _ in results:
+        print(f"{name:<16}{total:>12.3f}{total / args.puzzles:>12.3f}{legacy_time / total:>9.1f}x")
+    print("-" * 50)
+    print("生成结果一致:", all(puzzles == results[0][2] for _, _, puzzles in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+MRVLCVSolver 中 LCV 排序的开销对比：原始逐值扫描邻居 / 一次扫描邻居累计计数。
+
+两种实现的排序结果完全相同，因此节点数与回溯数一致，只比较 LCV 排序本身的耗时
+以及总求解时间。
+
+用法（在项目根目录）：
+    python benchmarks/bench_lcv.py [--puzzles 200] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# 导入路径配置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithms.solver_mrv_lcv import MRVLCVSolver
+from src.formats.text_format import parse_puzzle
+from src.generator.transforms import random_isomorph
+
+SAMPLES = [
+    "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79",
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+]
+
+
+class TimedSolver(MRVLCVSolver):
+    """累计 _order_values_lcv 的耗时。"""
+
+    def __init__(self):
+        super().__init__()
+        self.lcv_time = 0.0
+
+    def _order_values_lcv(self, board, row, col, candidates):
+        start = time.perf_counter()
+        ordered = super()._order_values_lcv(board, row, col, candidates)
+        self.lcv_time += time.perf_counter() - start
+        return ordered
+
+
+class LegacySolver(TimedSolver):
+    """LCV 计数改回原始实现：每个候选值都重新扫描行、列、宫中的全部邻居。"""
+
+    def _order_values_lcv(self, board, row, col, candidates):
+        start = time.perf_counter()
+        n, b = self.size, self.box_size
+
+        def count_constraint(value):
+            count = 0
+            bit = 1 << (value - 1)
+            for i in range(n):
+                if board[row][i] == 0 and i != col:
+                    if self._candidate_mask(row, i) & bit:
+                        count += 1
+                if board[i][col] == 0 and i != row:
+                    if self._candidate_mask(i, col) & bit:
+                        count += 1
+            br = (row // b) * b
+            bc = (col // b) * b
+            for r in range(br, br + b):
+                for c in range(bc, bc + b):
+                    if (r == row and c == col) or board[r][c] != 0:
+                        continue
+                    if self._candidate_mask(r, c) & bit:
+                        count += 1
+            return count
+
+        pairs = [(v, count_constraint(v)) for v in candidates]
+        pairs.sort(key=lambda x: x[1])
+        self.lcv_time += time.perf_counter() - start
+        return [v for v, _ in pairs]
+
+
+def run(solver, puzzles):
+    """求解全部题目，返回 (总时间, LCV 时间, 节点数, 回溯数, 解列表)。"""
+    nodes = backtracks = 0
+    solutions = []
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        solutions.append(solver.solve(puzzle))
+        nodes += solver.stats.nodes
+        backtracks += solver.stats.backtracks
+    return time.perf_counter() - start, solver.lcv_time, nodes, backtracks, solutions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LCV 排序开销对比")
+    parser.add_argument("--puzzles", type=int, default=200, help="题目数量（样题的随机等价变换）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    puzzles = [random_isomorph(parse_puzzle(rng.choice(SAMPLES)), rng) for _ in range(args.puzzles)]
+
+    results = [(name, *run(solver, puzzles))
+               for name, solver in (("逐值扫描", LegacySolver()), ("一次扫描计数", TimedSolver()))]
+
+    print(f"{'LCV 实现':<14}{'总时间(s)':>12}{'LCV(s)':>10}{'LCV占比':>10}{'节点数':>10}{'回溯数':>10}")
+    print("-" * 66)
+    for name, total, lcv, nodes, backtracks, _ in results:
+        print(f"{name:<14}{total:>12.3f}{lcv:>10.3f}{lcv / total:>9.0%}{nodes:>10}{backtracks:>10}")
+    print("-" * 66)
+    legacy, memo = results
+    print(f"LCV 加速比: {legacy[2] / memo[2]:.1f}x，总加速比: {legacy[1] / memo[1]:.1f}x")
+    print("结果一致:", legacy[3:] == memo[3:])
+
+
+if __name__ == "__main__":
+    main()
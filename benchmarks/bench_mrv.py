@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+MRVLCVSolver 选格的开销对比：逐格扫描 / 按候选数分桶（MRVBuckets），以及不同平局规则的效果。
+
+- "逐格扫描" 把选格改回原始实现（每个节点扫描全部格子），分桶仍照常维护，
+  与 "分桶 index" 的选格结果完全相同，节点数一致，只比较选格本身的耗时
+- "degree" / "wdeg" 改变候选数相同时的选择，节点数会不同
+- AC3_MRV_LCV_Solver 没有分桶：它每个节点都要改动很多格子的 domain，同步分桶的开销
+  抵消了省下的扫描（实测选格 0.9x、总时间 1.0x），所以保留逐格扫描
+
+用法（在项目根目录）：
+    python benchmarks/bench_mrv.py [--puzzles 50] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# 导入路径配置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithms.solver_mrv_lcv import MRVLCVSolver
+from src.formats.text_format import parse_puzzle
+from src.generator.transforms import random_isomorph
+
+SAMPLES = [
+    "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79",
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+]
+
+
+class TimedMRV(MRVLCVSolver):
+    """累计 _find_mrv_cell 的耗时。"""
+
+    def __init__(self, tie_break="index"):
+        super().__init__(tie_break=tie_break)
+        self.select_time = 0.0
+
+    def _find_mrv_cell(self, board):
+        start = time.perf_counter()
+        cell = super()._find_mrv_cell(board)
+        self.select_time += time.perf_counter() - start
+        return cell
+
+
+class ScanMRV(TimedMRV):
+    """选格改回原始实现：每个节点逐格重算候选掩码，遇到 1 个候选时提前结束。"""
+
+    def _find_mrv_cell(self, board):
+        start = time.perf_counter()
+        if self._seed_candidates is not None:
+            seed, self._seed_candidates = self._seed_candidates, None
+            cell = self._find_mrv_cell_from(board, seed)
+        else:
+            cell = self._scan(board)
+        self.select_time += time.perf_counter() - start
+        return cell
+
+    def _scan(self, board):
+        n = self.size
+        best_row, best_col, best_mask, best_count = -1, -1, 0, n + 1
+        all_digits, popcount = self._all_digits, self._popcount
+        row_used, col_used, box_used = self._row_used, self._col_used, self._box_used
+        for r in range(n):
+            board_row, used_r, box_row = board[r], row_used[r], self._box_of[r]
+            for c in range(n):
+                if board_row[c] == 0:
+                    mask = all_digits & ~(used_r | col_used[c] | box_used[box_row[c]])
+                    count = popcount(mask)
+                    if count < best_count:
+                        best_row, best_col, best_mask, best_count = r, c, mask, count
+                        if count == 1:
+                            return best_row, best_col, set(self._mask_digits(best_mask))
+        if best_count == n + 1:
+            return None
+        return best_row, best_col, set(self._mask_digits(best_mask))
+
+
+def run(solver, puzzles):
+    """求解全部题目，返回 (总时间, 选格时间, 节点数, 回溯数, 解列表)。"""
+    nodes = backtracks = 0
+    solutions = []
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        solutions.append(solver.solve(puzzle))
+        nodes += solver.stats.nodes
+        backtracks += solver.stats.backtracks
+    return time.perf_counter() - start, solver.select_time, nodes, backtracks, solutions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MRV 选格开销与平局规则对比")
+    parser.add_argument("--puzzles", type=int, default=50, help="题目数量（样题的随机等价变换）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    puzzles = [random_isomorph(parse_puzzle(rng.choice(SAMPLES)), rng) for _ in range(args.puzzles)]
+
+    results = [("逐格扫描", *run(ScanMRV(), puzzles))]
+    results += [(f"分桶 {tie_break}", *run(TimedMRV(tie_break), puzzles))
+                for tie_break in ("index", "degree", "wdeg")]
+
+    print("\n[MRV + LCV]")
+    print(f"{'选格实现':<14}{'总时间(s)':>12}{'选格(s)':>10}{'选格占比':>10}{'节点数':>10}{'回溯数':>10}")
+    print("-" * 66)
+    for name, total, select, nodes, backtracks, _ in results:
+        print(f"{name:<14}{total:>12.3f}{select:>10.3f}{select / total:>9.0%}{nodes:>10}{backtracks:>10}")
+    print("-" * 66)
+    scan, bucket = results[0], results[1]
+    print(f"选格加速比: {scan[2] / bucket[2]:.1f}x，总加速比: {scan[1] / bucket[1]:.1f}x")
+    print("index 与逐格扫描结果一致:", scan[3:] == bucket[3:])
+
+
+if __name__ == "__main__":
+    main()
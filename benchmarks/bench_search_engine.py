@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+显式栈搜索与递归搜索的单层开销对比。
+
+- MRV / AC-3 / 计数器："递归" 用一个递归驱动调用同一个 _expand 和同一批分支生成器，
+  每个节点占一层 Python 调用；"显式栈" 是 search_engine.DepthFirstSearch。两者展开的节点完全相同，
+  差别只在推进搜索的方式
+- DLX："递归" 是改为显式栈之前的递归 _search 原样保留；"显式栈" 是当前 _search 中手写的列 / 行栈
+- 空节点：每层 3 个分支、深 9 层、不做任何求解工作的搜索树，只剩推进搜索本身的开销
+- 每轮交替运行两种实现，取多轮中的最短 CPU 时间（process_time），减小机器抖动的影响
+
+用法（在项目根目录）：
+    python benchmarks/bench_search_engine.py [--puzzles 40] [--rounds 7] [--seed 0] [--solver tree|mrv|ac3|dlx|count|all]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from functools import partial
+
+# 导入路径配置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithms.search_engine import SOLVED, DepthFirstSearch
+from src.algorithms.solution_counter import SolutionCounter
+from src.algorithms.solver_ac3_mrv_lcv import AC3_MRV_LCV_Solver
+from src.algorithms.solver_dlx import DLXSolver
+from src.algorithms.solver_mrv_lcv import MRVLCVSolver
+from src.formats.text_format import parse_puzzle
+from src.generator.transforms import random_isomorph
+
+SAMPLES = [
+    "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79",
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+]
+
+
+def run_recursive(expand):
+    """与 DepthFirstSearch(expand).run() 结果相同的递归驱动：每个节点一层 Python 调用。"""
+
+    def visit():
+        branches = expand()
+        if branches is SOLVED:
+            return True
+        if branches is not None:
+            for _ in branches:
+                if visit():
+                    return True
+        return False
+
+    return visit()
+
+
+@dataclass
+class TreeStats:
+    nodes: int = 0
+
+
+class StackTree:
+    """不做任何求解工作的搜索树，题目只决定搜索次数。"""
+    branching, height = 3, 9
+
+    def solve(self, puzzle):
+        self.stats = TreeStats()
+        self._depth = 0
+        return self._run()
+
+    def _run(self):
+        return DepthFirstSearch(self._expand).run()
+
+    def _expand(self):
+        if self._depth == self.height:
+            return None
+        return self._branches()
+
+    def _branches(self):
+        stats = self.stats
+        for _ in range(self.branching):
+            stats.nodes += 1
+            self._depth += 1
+            yield
+            self._depth -= 1
+
+
+class RecursiveTree(StackTree):
+    def _run(self):
+        return run_recursive(self._expand)
+
+
+class RecursiveMRV(MRVLCVSolver):
+    def _backtrack(self, board):
+        return run_recursive(partial(self._expand, board))
+
+
+class RecursiveAC3(AC3_MRV_LCV_Solver):
+    def _backtrack(self, board, domains):
+        return run_recursive(partial(self._expand, board, domains))
+
+
+class RecursiveCounter(SolutionCounter):
+    def _search(self, k):
+        self._k = k
+        run_recursive(self._expand)
+
+
+class RecursiveDLX(DLXSolver):
+    """改为显式栈之前的递归 Algorithm X。"""
+
+    def _search(self, record=True, animate=True):
+        R, D, C, S = self._R, self._D, self._C, self._S
+        if R[0] == 0:
+            self._count += 1
+            if record and self._solution is None:
+                self._solution = self._decode()
+            return self._count >= self._limit
+
+        best = 0
+        best_size = self.size + 1
+        j = R[0]
+        while j != 0:
+            if S[j] < best_size:
+                best, best_size = j, S[j]
+                if best_size <= 1:
+                    break
+            j = R[j]
+        if best_size == 0:
+            return False
+
+        self._cover(best)
+        r = D[best]
+        while r != best:
+            self.stats.nodes += 1
+            self._chosen.append(r)
+            j = R[r]
+            while j != r:
+                self._cover(C[j])
+                j = R[j]
+            if self._search(record, animate):
+                return True
+            j = self._L[r]
+            while j != r:
+                self._uncover(C[j])
+                j = self._L[j]
+            self._chosen.pop()
+            self.stats.backtracks += 1
+            r = D[r]
+        self._uncover(best)
+        return False
+
+
+def solve_all(solver, puzzles):
+    """求解全部题目，返回 (CPU 时间, 节点数, 结果列表)。"""
+    nodes = 0
+    results = []
+    start = time.process_time()
+    for puzzle in puzzles:
+        results.append(solver.solve(puzzle))
+        nodes += solver.stats.nodes
+    return time.process_time() - start, nodes, results
+
+
+def count_all(counter, puzzles):
+    nodes = 0
+    results = []
+    start = time.process_time()
+    for puzzle in puzzles:
+        results.append(counter.count(puzzle, limit=2))
+        nodes += counter.stats.nodes
+    return time.process_time() - start, nodes, results
+
+
+GROUPS = {
+    "tree": ("空节点", RecursiveTree, StackTree, solve_all),
+    "mrv": ("MRV + LCV", RecursiveMRV, MRVLCVSolver, solve_all),
+    "ac3": ("AC-3 + MRV + LCV", RecursiveAC3, AC3_MRV_LCV_Solver, solve_all),
+    "dlx": ("DLX", RecursiveDLX, DLXSolver, solve_all),
+    "count": ("SolutionCounter", RecursiveCounter, SolutionCounter, count_all),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="显式栈搜索与递归搜索的单层开销对比")
+    parser.add_argument("--puzzles", type=int, default=40, help="题目数量（样题的随机等价变换）")
+    parser.add_argument("--rounds", type=int, default=7, help="交替运行的轮数（取最短时间）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--solver", choices=sorted(GROUPS) + ["all"], default="all", help="参与对比的求解器")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    puzzles = [random_isomorph(parse_puzzle(rng.choice(SAMPLES)), rng) for _ in range(args.puzzles)]
+    names = list(GROUPS) if args.solver == "all" else [args.solver]
+
+    print(f"{'求解器':<20}{'递归(s)':>10}{'显式栈(s)':>12}{'比值':>8}{'节点数':>10}{'差/节点(us)':>14}  结果一致")
+    print("-" * 84)
+    for name in names:
+        title, recursive_cls, stack_cls, run = GROUPS[name]
+        best = {}
+        outputs = {}
+        for _ in range(args.rounds):
+            for label, cls in (("recursive", recursive_cls), ("stack", stack_cls)):
+                elapsed, nodes, results = run(cls(), puzzles)
+                best[label] = min(best.get(label, elapsed), elapsed)
+                outputs[label] = (nodes, results)
+        rec, stack = best["recursive"], best["stack"]
+        nodes = outputs["stack"][0]
+        same = outputs["recursive"] == outputs["stack"]
+        per_node = (stack - rec) / max(nodes, 1) * 1e6
+        print(f"{title:<20}{rec:>10.3f}{stack:>12.3f}{stack / rec:>8.2f}{nodes:>10}{per_node:>14.3f}  {same}")
+    print("-" * 84)
+    print("比值 = 显式栈 / 递归；差/节点 为负表示显式栈的单层开销更低")
+
+
+if __name__ == "__main__":
+    main()
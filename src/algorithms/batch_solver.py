@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+批量求解接口：把大量题目分块交给进程池并行求解。
+
+- 每个工作进程只创建一次求解器实例，之后的所有分块都复用它
+- 输入是任意可迭代对象，按块惰性读取，同时在途的分块数量有上限，
+  因此可以流式处理几万甚至几百万道题而不必一次性载入内存
+- 结果默认按输入顺序返回；ordered=False 时按完成顺序返回（吞吐更高）
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.algorithms.flat_board import copy_board
+from src.algorithms.solution_cache import CachedSolver, SolutionCache
+from src.algorithms.solver_ac3_mrv_lcv import AC3_MRV_LCV_Solver
+from src.algorithms.solver_basic_v1 import SudokuSolver
+from src.algorithms.solver_dlx import DLXSolver
+from src.algorithms.solver_mrv_lcv import MRVLCVSolver
+from src.formats.binary_format import BinaryCorpus
+
+Board = List[List[int]]  # NxN（默认 9x9）, 0 表示空格
+
+# 算法名 -> 求解器工厂（参数为 box_size）
+SOLVER_FACTORIES: Dict[str, Callable[[int], Any]] = {
+    "basic": lambda box_size: SudokuSolver(box_size=box_size, verbose=False),
+    "mrv_lcv": lambda box_size: MRVLCVSolver(box_size=box_size),
+    "ac3": lambda box_size: AC3_MRV_LCV_Solver(box_size=box_size),
+    "dlx": lambda box_size: DLXSolver(box_size=box_size),
+}
+
+
+class SolveResult(NamedTuple):
+    index: int  # 题目在输入中的序号（从 0 开始）
+    solution: Optional[Board]  # 解盘；无解时为 None
+    stats: Any  # 对应求解器的 SolveStats
+
+
+# 工作进程内复用的求解器实例（由 _init_worker 创建）
+_worker_solver = None
+
+
+def make_solver(algorithm: str, box_size: int = 3, cache_size: int = 0):
+    """
+    按算法名创建求解器；未知算法抛出 ValueError。
+    cache_size > 0 时在求解器前加一层最多 cache_size 条的解缓存（solution_cache.CachedSolver）。
+    """
+    if algorithm not in SOLVER_FACTORIES:
+        raise ValueError(f"未知算法: {algorithm}，可选: {list(SOLVER_FACTORIES)}")
+    solver = SOLVER_FACTORIES[algorithm](box_size)
+    if cache_size > 0:
+        solver = CachedSolver(solver, SolutionCache(max_entries=cache_size))
+    return solver
+
+
+def _init_worker(algorithm: str, box_size: int, cache_size: int = 0) -> None:
+    global _worker_solver
+    _worker_solver = make_solver(algorithm, box_size, cache_size)
+
+
+def _solve_chunk(chunk: List[Tuple[int, Board]], solver=None) -> List[SolveResult]:
+    """求解一个分块。solver 为空时使用工作进程内的实例。"""
+    solver = solver or _worker_solver
+    results = []
+    for index, board in chunk:
+        # 基础 DFS 会原地修改输入，统一先复制一份
+        solution = solver.solve(copy_board(board))
+        results.append(SolveResult(index, solution, solver.stats))
+    return results
+
+
+def _chunks(puzzles: Iterable[Board], chunksize: int) -> Iterator[List[Tuple[int, Board]]]:
+    """把输入按 chunksize 切块，并附上序号；惰性读取。"""
+    it = enumerate(puzzles)
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_many(
+        puzzles: Iterable[Board],
+        algorithm: str = "dlx",
+        workers: Optional[int] = None,
+        chunksize: int = 64,
+        ordered: bool = True,
+        box_size: int = 3,
+        cache_size: int = 0,
+) -> Iterator[SolveResult]:
+    """
+    批量求解，逐个产出 SolveResult(index, solution, stats)。
+
+    参数:
+        puzzles: 题目的可迭代对象（可以是生成器，按需读取），
+                 或二进制题库（BinaryCorpus / 文件路径，见 formats.binary_format）
+        algorithm: "basic" / "mrv_lcv" / "ac3" / "dlx"
+        workers: 工作进程数，默认 CPU 核数；<= 1 时在当前进程内求解
+        chunksize: 每次发给工作进程的题目数
+        ordered: True 按输入顺序返回；False 按完成顺序返回
+        box_size: 宫的边长（3 -> 9x9）
+        cache_size: > 0 时每个进程的求解器带一个该条数的解缓存（输入中有重复题目时使用）
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize 必须为正整数: {chunksize}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if isinstance(puzzles, (str, os.PathLike)):
+        puzzles = BinaryCorpus(puzzles)
+
+    if workers <= 1:
+        solver = make_solver(algorithm, box_size, cache_size)
+        for chunk in _chunks(puzzles, chunksize):
+            yield from _solve_chunk(chunk, solver)
+        return
+
+    # 提前校验算法名，避免错误在工作进程里才暴露
+    make_solver(algorithm, box_size)
+    # 在途分块上限：足够让所有进程保持忙碌，又不会把整个输入读进内存
+    max_pending = workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(algorithm, box_size, cache_size)) as pool:
+        if ordered:
+            pending = deque()
+            try:
+                for chunk in _chunks(puzzles, chunksize):
+                    pending.append(pool.submit(_solve_chunk, chunk))
+                    if len(pending) >= max_pending:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+        else:
+            pending = set()
+            try:
+                for chunk in _chunks(puzzles, chunksize):
+                    pending.add(pool.submit(_solve_chunk, chunk))
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+紧凑的扁平棋盘：N*N 个格子存放在一块连续的 bytearray 中（每格 1 字节）。
+
+FlatBoard 本身是 "行视图" 的列表：board[r] 是底层缓冲区的一段 memoryview，
+board[r][c] 的读写直接作用在同一块内存上，因此所有按 List[List[int]] 写的
+求解器代码都能原样使用它，而复制 / 序列化只是一次 bytes 拷贝：
+- copy() / deepcopy：复制 N*N 字节，而不是 N 个列表
+- pickle：只传输 N*N 字节（多进程批量求解时很便宜）
+- to_rows() / from_rows()：与 List[List[int]] 互相转换
+"""
+
+from math import isqrt
+from typing import Iterable, List, Sequence, Union
+
+Board = List[List[int]]  # NxN, 0 表示空格
+
+
+class FlatBoard(list):
+    """由一块 bytearray 支撑的 N×N 棋盘，行为与 List[List[int]] 一致。"""
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], size: int = 9):
+        """
+        :param data: 长度为 size * size 的缓冲区；bytearray 会被直接引用（零拷贝），
+                     其它类型会复制为 bytearray
+        :param size: 盘面边长
+        """
+        if not isinstance(data, bytearray):
+            data = bytearray(data)
+        if len(data) != size * size:
+            raise ValueError(f"缓冲区长度应为 {size * size}，实际为 {len(data)}")
+        view = memoryview(data)
+        super().__init__(view[r * size:(r + 1) * size] for r in range(size))
+        self.data = data
+        self.size = size
+
+    # ---------- 构造 ----------
+
+    @classmethod
+    def empty(cls, size: int = 9) -> "FlatBoard":
+        return cls(bytearray(size * size), size)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> "FlatBoard":
+        """从 List[List[int]]（或另一个 FlatBoard）构造。"""
+        if isinstance(rows, FlatBoard):
+            return rows.copy()
+        return cls(bytearray(v for row in rows for v in row), len(rows))
+
+    @classmethod
+    def from_flat(cls, values: Iterable[int], size: int = 0) -> "FlatBoard":
+        """从按行优先排列的 N*N 个数字构造；size 省略时由长度推断。"""
+        data = bytearray(values)
+        return cls(data, size or isqrt(len(data)))
+
+    # ---------- 转换与复制 ----------
+
+    def to_rows(self) -> Board:
+        """转换为普通的 List[List[int]]。"""
+        return [row.tolist() for row in self]
+
+    def tobytes(self) -> bytes:
+        return bytes(self.data)
+
+    def copy(self) -> "FlatBoard":
+        return FlatBoard(bytearray(self.data), self.size)
+
+    def __copy__(self) -> "FlatBoard":
+        return self.copy()
+
+    def __deepcopy__(self, memo) -> "FlatBoard":
+        return self.copy()
+
+    def __reduce__(self):
+        return FlatBoard, (bytes(self.data), self.size)
+
+    # ---------- 比较与显示 ----------
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FlatBoard):
+            return self.data == other.data
+        if isinstance(other, list):
+            return len(other) == self.size and all(
+                list(row) == list(other_row) for row, other_row in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # 可变对象，与 list 一致不可哈希
+
+    def __repr__(self) -> str:
+        return f"FlatBoard({self.to_rows()!r})"
+
+
+def copy_board(board: Board) -> Board:
+    """复制棋盘并保持类型：FlatBoard 复制字节，列表逐行切片（代替 deepcopy）。"""
+    if isinstance(board, FlatBoard):
+        return board.copy()
+    return [row[:] for row in board]
+
+
+if __name__ == "__main__":
+    import pickle
+
+    rows = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+    board = FlatBoard.from_rows(rows)
+    board[0][0] = 0
+    print("与列表相等:", board == [[0] + rows[0][1:]] + rows[1:])
+    print("pickle 字节数:", len(pickle.dumps(board)), "vs 列表", len(pickle.dumps(rows)))
+    print("复制后独立:", copy_board(board).data is not board.data)
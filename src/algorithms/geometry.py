@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+N×N 数独的盘面几何信息（按宫的边长 box_size 缓存）。
+
+box_size = 2 / 3 / 4 / 5 分别对应 4×4 / 9×9 / 16×16 / 25×25 的盘面。
+格子用下标 i = r * size + c 表示；候选集用 size 位掩码表示，
+第 (v - 1) 位为 1 表示数字 v 可用。
+"""
+
+from functools import lru_cache
+from math import isqrt
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+# 掩码查表的最大位数：16 位的 popcount 表只有 65536 项
+_POPCOUNT_TABLE_BITS = 16
+# 掩码 -> 数字列表 的查表只对 9×9 及以下建立
+_DIGITS_TABLE_BITS = 9
+
+
+class BoardGeometry(NamedTuple):
+    box_size: int  # 宫的边长
+    size: int  # 盘面边长 = box_size ** 2，也是数字个数
+    cells: int  # 格子总数 = size ** 2
+    all_digits: int  # 全部数字的掩码
+    row_units: List[List[int]]
+    col_units: List[List[int]]
+    box_units: List[List[int]]
+    units: List[List[int]]  # 行 + 列 + 宫
+    peers: List[Tuple[int, ...]]  # 每个格子的邻居（同行、同列、同宫）
+    box_of: List[int]  # 每个格子所在宫的编号
+    # 宫与行/列的交集：(交集格子, 宫内其余格子, 行/列其余格子)
+    intersections: List[Tuple[List[int], List[int], List[int]]]
+    popcount: Callable[[int], int]  # 掩码中 1 的个数
+    digits: Callable[[int], Sequence[int]]  # 掩码 -> 升序数字
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+@lru_cache(maxsize=None)
+def board_geometry(box_size: int = 3) -> BoardGeometry:
+    """返回边长为 box_size ** 2 的盘面几何信息（结果会被缓存）。"""
+    if box_size < 1:
+        raise ValueError(f"宫的边长必须为正整数: {box_size}")
+    b = box_size
+    n = b * b
+
+    row_units = [[r * n + c for c in range(n)] for r in range(n)]
+    col_units = [[r * n + c for r in range(n)] for c in range(n)]
+    box_units = [[(br + r) * n + bc + c for r in range(b) for c in range(b)]
+                 for br in range(0, n, b) for bc in range(0, n, b)]
+    units = row_units + col_units + box_units
+
+    box_of = [(i // n // b) * b + (i % n) // b for i in range(n * n)]
+    peers = []
+    for i in range(n * n):
+        r, c = divmod(i, n)
+        neighs = set(row_units[r]) | set(col_units[c]) | set(box_units[box_of[i]])
+        neighs.discard(i)
+        peers.append(tuple(sorted(neighs)))
+
+    intersections = []
+    for box in box_units:
+        box_set = set(box)
+        for line in row_units + col_units:
+            segment = [i for i in line if i in box_set]
+            if segment:
+                seg_set = set(segment)
+                intersections.append((
+                    segment,
+                    [i for i in box if i not in seg_set],
+                    [i for i in line if i not in seg_set],
+                ))
+
+    all_digits = (1 << n) - 1
+    if n <= _POPCOUNT_TABLE_BITS:
+        popcount = [_popcount(m) for m in range(all_digits + 1)].__getitem__
+    else:
+        popcount = _popcount
+    if n <= _DIGITS_TABLE_BITS:
+        digits = [tuple(v for v in range(1, n + 1) if m >> (v - 1) & 1)
+                  for m in range(all_digits + 1)].__getitem__
+    else:
+        def digits(mask: int) -> Tuple[int, ...]:
+            return tuple(v for v in range(1, n + 1) if mask >> (v - 1) & 1)
+
+    return BoardGeometry(b, n, n * n, all_digits, row_units, col_units, box_units,
+                         units, peers, box_of, intersections, popcount, digits)
+
+
+def box_size_of(board: Sequence[Sequence[int]]) -> int:
+    """根据盘面边长推断宫的边长；边长不是平方数时抛出 ValueError。"""
+    box_size = isqrt(len(board))
+    if box_size * box_size != len(board):
+        raise ValueError(f"盘面边长必须是平方数: {len(board)}")
+    return box_size
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+MRV 选格用的分桶结构：按候选数（domain 大小）把未赋值的格子放进 0..N 号桶。
+
+- 每个桶是以格子下标为位的位集（Python int），选格时找最小的非空桶，不再逐格扫描盘面
+- 求解器在赋值 / 撤销时调用 add / remove / move / shift，只更新受影响的格子（O(邻居数)）
+- 平局规则 tie_break：
+    "index"   下标最小（行优先的第一个），与原先逐格扫描选出的格子完全相同
+    "degree"  未赋值邻居最多（度启发式）
+    "wdeg"    所在行 / 列 / 宫的失败权重之和最大（dom/wdeg）；求解器遇到死路时调用
+              bump，把该格所在三个单元的权重各加 1
+
+与原先的扫描一致：只要存在候选数 <= 1 的格子，就只在 0、1 号桶里选
+（扫描遇到 1 个候选时提前结束，选出的是行优先第一个候选数 <= 1 的格子）。
+"""
+
+from typing import List
+
+from src.algorithms.geometry import board_geometry
+
+TIE_BREAKS = ("index", "degree", "wdeg")
+
+
+class MRVBuckets:
+    def __init__(self, box_size: int = 3, tie_break: str = "index"):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"tie_break 必须是: {list(TIE_BREAKS)}")
+        geo = board_geometry(box_size)
+        n = geo.size
+        self.tie_break = tie_break
+        self._peers = geo.peers
+        # 每个格子所在的 行 / 列 / 宫 单元编号（wdeg 权重下标）
+        self._units_of = [(i // n, n + i % n, 2 * n + geo.box_of[i]) for i in range(geo.cells)]
+        self._n = n
+        self._cells = geo.cells
+        self.reset()
+
+    def reset(self) -> None:
+        """清空所有桶（求解开始时调用）。"""
+        # buckets[k]：候选数为 k 的未赋值格子的位集
+        self.buckets: List[int] = [0] * (self._n + 1)
+        # 格子当前所在的桶，-1 表示不在结构中（已赋值或给定数字）
+        self.sizes: List[int] = [-1] * self._cells
+        # 未赋值邻居数（仅 degree 规则维护）
+        self.degree: List[int] = [0] * self._cells
+        # 行 / 列 / 宫的失败权重（仅 wdeg 规则使用）
+        self.weights: List[int] = [1] * (3 * self._n)
+
+    def add(self, i: int, size: int) -> None:
+        """把未赋值的格子 i 放进 size 号桶。"""
+        self.sizes[i] = size
+        self.buckets[size] |= 1 << i
+        if self.tie_break == "degree":
+            degree = self.degree
+            for p in self._peers[i]:
+                degree[p] += 1
+
+    def remove(self, i: int) -> None:
+        """格子 i 被赋值，移出结构。"""
+        self.buckets[self.sizes[i]] &= ~(1 << i)
+        self.sizes[i] = -1
+        if self.tie_break == "degree":
+            degree = self.degree
+            for p in self._peers[i]:
+                degree[p] -= 1
+
+    def move(self, i: int, size: int) -> None:
+        """格子 i 的候选数变为 size；不在结构中的格子忽略。"""
+        old = self.sizes[i]
+        if old < 0 or old == size:
+            return
+        bit = 1 << i
+        buckets = self.buckets
+        buckets[old] &= ~bit
+        buckets[size] |= bit
+        self.sizes[i] = size
+
+    def shift(self, cells: int, delta: int) -> None:
+        """位集 cells 中每个格子的候选数都加 delta（赋值时 -1，撤销时 +1）；不在结构中的格子忽略。"""
+        sizes, buckets = self.sizes, self.buckets
+        while cells:
+            low = cells & -cells
+            i = low.bit_length() - 1
+            old = sizes[i]
+            if old >= 0:
+                buckets[old] ^= low
+                buckets[old + delta] |= low
+                sizes[i] = old + delta
+            cells ^= low
+
+    def bump(self, i: int) -> None:
+        """格子 i 的候选被排除光（死路）：所在单元的失败权重加 1。"""
+        if self.tie_break == "wdeg":
+            weights = self.weights
+            for u in self._units_of[i]:
+                weights[u] += 1
+
+    def select(self) -> int:
+        """按 MRV 与平局规则选一个格子，返回其下标；结构为空时返回 -1。"""
+        buckets = self.buckets
+        if self.tie_break == "index":
+            cells = buckets[0] | buckets[1]
+            if not cells:
+                for cells in buckets:
+                    if cells:
+                        break
+                else:
+                    return -1
+            return (cells & -cells).bit_length() - 1
+
+        # 已有死路时直接返回，让求解器立即回溯
+        cells = buckets[0]
+        if cells:
+            return (cells & -cells).bit_length() - 1
+        for cells in buckets:
+            if cells:
+                break
+        else:
+            return -1
+        if self.tie_break == "degree":
+            score = self.degree.__getitem__
+        else:
+            weights, units_of = self.weights, self._units_of
+
+            def score(i: int) -> int:
+                a, b, c = units_of[i]
+                return weights[a] + weights[b] + weights[c]
+
+        best, best_score = -1, -1
+        while cells:
+            low = cells & -cells
+            i = low.bit_length() - 1
+            s = score(i)
+            if s > best_score:
+                best, best_score = i, s
+            cells ^= low
+        return best
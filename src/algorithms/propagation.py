@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Sudoku constraint propagation shared by all solvers.
+
+在搜索之前反复应用以下推理规则，直到盘面不再变化（不动点）：
+- 唯一候选（naked single）：某空格只剩一个候选数
+- 隐性唯一（hidden single）：某数字在一个行/列/宫中只剩一个位置
+- 宫区块排除（pointing）：宫内某数字只出现在同一行/列 -> 删去该行/列其余位置的该数字
+- 行列区块排除（box-line reduction）：行/列内某数字只出现在同一宫 -> 删去该宫其余位置的该数字
+
+候选集用 N 位掩码表示：第 (v - 1) 位为 1 表示数字 v 可用。
+盘面大小由 board 的边长推断（9×9、16×16、25×25 ...）。
+各求解器通过 use_propagation=True 选择启用。
+"""
+
+from typing import List, Optional, Tuple
+
+from src.algorithms.geometry import board_geometry, box_size_of
+
+Board = List[List[int]]  # N×N, 0 表示空格
+Placement = Tuple[int, int, int]  # (row, col, value)
+
+
+def compute_candidates(board: Board) -> Optional[List[int]]:
+    """
+    计算每个格子的候选掩码（长度 N*N，已填格子为 0）。
+    若已知数之间互相冲突，返回 None。
+    """
+    geo = board_geometry(box_size_of(board))
+    flat = [v for row in board for v in row]
+    used = [0] * geo.cells
+    cand = [0] * geo.cells
+    for i, v in enumerate(flat):
+        if v != 0:
+            bit = 1 << (v - 1)
+            for p in geo.peers[i]:
+                if flat[p] == v:
+                    return None
+                used[p] |= bit
+    for i, v in enumerate(flat):
+        if v == 0:
+            cand[i] = geo.all_digits & ~used[i]
+    return cand
+
+
+def propagate(board: Board, candidates: Optional[List[int]] = None) -> Optional[List[Placement]]:
+    """
+    在 board 上原地应用唯一候选 / 隐性唯一 / 区块排除，直到不动点。
+
+    :param board: N×N 棋盘，推出的数字会直接写入
+    :param candidates: 可选的候选掩码（compute_candidates 的结果），会被原地更新；
+                       调用方可据此继续初始化自己的候选集
+    :return: 按推出顺序排列的 (row, col, value) 列表；
+             若发现矛盾，撤销本次写入的所有数字并返回 None
+    """
+    cand = candidates if candidates is not None else compute_candidates(board)
+    if cand is None:
+        return None
+
+    geo = board_geometry(box_size_of(board))
+    n = geo.size
+    all_digits = geo.all_digits
+    peers = geo.peers
+
+    placed: List[Placement] = []
+
+    def place(i: int, bit: int) -> bool:
+        if not cand[i] & bit:
+            return False
+        r, c = divmod(i, n)
+        board[r][c] = bit.bit_length()
+        cand[i] = 0
+        for p in peers[i]:
+            cand[p] &= ~bit
+        placed.append((r, c, bit.bit_length()))
+        return True
+
+    def fail() -> None:
+        for (r, c, _) in placed:
+            board[r][c] = 0
+
+    changed = True
+    while changed:
+        changed = False
+
+        # 唯一候选
+        for i in range(geo.cells):
+            m = cand[i]
+            if board[i // n][i % n] == 0:
+                if m == 0:
+                    fail()
+                    return None
+                if m & (m - 1) == 0:
+                    place(i, m)
+                    changed = True
+
+        # 隐性唯一：once / twice 掩码统计每个数字在单元中出现的次数
+        for unit in geo.units:
+            once = twice = filled = 0
+            for i in unit:
+                v = board[i // n][i % n]
+                if v != 0:
+                    filled |= 1 << (v - 1)
+                else:
+                    m = cand[i]
+                    twice |= once & m
+                    once |= m
+            if (once | filled) != all_digits:
+                # 某个数字在该单元中无处可放
+                fail()
+                return None
+            singles = once & ~twice & ~filled
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for i in unit:
+                    if cand[i] & bit:
+                        break
+                else:
+                    # 同一轮中该数字的唯一位置已被其它数字占用
+                    fail()
+                    return None
+                place(i, bit)
+                changed = True
+
+        if changed:
+            continue
+
+        # 区块排除：宫与行/列的交集
+        for segment, box_rest, line_rest in geo.intersections:
+            seg_mask = 0
+            for i in segment:
+                seg_mask |= cand[i]
+            if not seg_mask:
+                continue
+            box_mask = 0
+            for i in box_rest:
+                box_mask |= cand[i]
+            line_mask = 0
+            for i in line_rest:
+                line_mask |= cand[i]
+
+            # 宫内只出现在该交集 -> 从行/列其余格子删除
+            pointing = seg_mask & ~box_mask
+            if pointing & line_mask:
+                for i in line_rest:
+                    if cand[i] & pointing:
+                        cand[i] &= ~pointing
+                        changed = True
+            # 行/列内只出现在该交集 -> 从宫内其余格子删除
+            claiming = seg_mask & ~line_mask
+            if claiming & box_mask:
+                for i in box_rest:
+                    if cand[i] & claiming:
+                        cand[i] &= ~claiming
+                        changed = True
+
+    return placed
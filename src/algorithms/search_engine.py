@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+显式栈的深度优先搜索核心：求解器与生成器的回溯都在这里执行，不再占用 Python 递归深度。
+
+求解器提供 expand()，对当前状态展开一个搜索节点，返回：
+- SOLVED：找到解，搜索停止（栈中各层不撤销，与原先递归直接 return True 相同）
+- None：死路，直接回溯到上一层
+- 一个迭代器（通常是生成器）：该节点的各个分支。每次 next() 先撤销上一个分支（如有），
+  再应用下一个候选，然后 yield；候选用尽时撤销最后一个分支并结束
+
+生成器的写法与原先的递归函数一一对应：把 "if self._backtrack(...): return True"
+换成 yield，局部变量保存在生成器里，不必每层重新取属性。
+与对同一批分支生成器做递归调用的驱动相比，每推进一个分支多出约 0.5~1 微秒
+（benchmarks/bench_search_engine.py：MRV + LCV 约 1.1~1.2 倍，AC-3 约 1.01~1.09 倍）；
+分支生成器本身比原先的递归实现少取属性，整体上各求解器不比改用显式栈之前慢。
+
+run() 可以分段执行：给出 max_steps 时推进这么多个分支后暂停（返回 None），
+再次调用 run() 从暂停处继续。
+"""
+
+from typing import Callable, Iterator, List, Optional, Union
+
+# expand() 的返回值：找到解
+SOLVED = object()
+# 分支迭代器耗尽的标记
+_END = object()
+
+Expansion = Union[Iterator, None, object]
+
+
+class DepthFirstSearch:
+    def __init__(self, expand: Callable[[], Expansion]):
+        """
+        :param expand: 展开当前状态的函数，返回 SOLVED / None / 分支迭代器
+        """
+        self._expand = expand
+        # 各层尚未尝试完的分支迭代器，stack[:depth] 有效，stack[depth - 1] 为最深一层。
+        # 出栈只移动下标、不删除元素：按下标读写列表比 append / pop 的方法调用快，
+        # 留在下标之外的都是已经耗尽的迭代器，之后会被覆盖
+        self.stack: List[Iterator] = []
+        self._top = -1
+        # 下一步是展开新节点（True），还是推进栈顶的下一个分支（False）
+        self._descend = True
+        self.finished = False  # 搜索空间已经穷尽
+
+    @property
+    def depth(self) -> int:
+        return self._top + 1
+
+    def run(self, max_steps: Optional[int] = None) -> Optional[bool]:
+        """
+        继续搜索。
+        :return: True 找到解；False 搜索完毕无解；None 推进了 max_steps 个分支后暂停
+        """
+        if self.finished:
+            return False
+        if not self._descend:
+            # 上次找到解后停在栈顶分支里：先换到下一个分支
+            self._descend = True
+            if not self._advance():
+                return False
+            if max_steps is not None:
+                max_steps -= 1
+                if max_steps <= 0:
+                    return None
+        if max_steps is not None:
+            return self._run_steps(max_steps)
+
+        # 不限步数时的主循环：不计数。迭代器一律用 "for ... break" 推进一步，
+        # 比调用 next(it, default) 少一次内置函数调用
+        stack, expand = self.stack, self._expand
+        top = self._top
+        while True:
+            branches = expand()
+            if branches is not None:
+                if branches is SOLVED:
+                    self._top, self._descend = top, False
+                    return True
+                # 新节点直接进入第一个分支后入栈；一个分支也没有时与死路相同
+                for _ in branches:
+                    top += 1
+                    try:
+                        stack[top] = branches
+                    except IndexError:
+                        stack.append(branches)
+                    break
+                else:
+                    branches = None
+                if branches is not None:
+                    continue
+            # 回溯：推进最深一层的下一个分支，用尽（已撤销）的层出栈
+            while top >= 0:
+                for _ in stack[top]:
+                    break
+                else:
+                    top -= 1
+                    continue
+                break
+            else:
+                self._top, self.finished = top, True
+                return False
+
+    def _run_steps(self, remaining: int) -> Optional[bool]:
+        """与 run() 的主循环相同，但每进入一个分支计数一次，满 remaining 个后暂停。"""
+        while True:
+            branches = self._expand()
+            if branches is SOLVED:
+                self._descend = False
+                return True
+            if branches is not None:
+                self._top += 1
+                if self._top < len(self.stack):
+                    self.stack[self._top] = branches
+                else:
+                    self.stack.append(branches)
+            if not self._advance():
+                return False
+            remaining -= 1
+            if remaining <= 0:
+                return None
+
+    def _advance(self) -> bool:
+        """推进最深一层的下一个分支，用尽（已撤销）的层出栈；搜索空间穷尽时返回 False。"""
+        stack = self.stack
+        while self._top >= 0:
+            if next(stack[self._top], _END) is not _END:
+                return True
+            self._top -= 1
+        self.finished = True
+        return False
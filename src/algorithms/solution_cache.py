@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+有界的解缓存：同一道题（或与之等价的题）再次求解时直接返回缓存的解。
+
+- 键：key="board" 时为盘面本身的字节（精确匹配）；
+      key="canonical" 时为 minlex 规范形式（transforms.minlex），等价的题目共用一条缓存，
+      缓存中保存规范坐标下的解，命中时经 "盘面 -> 规范形式" 变换的逆变换映射回原盘面
+- 淘汰：LRU，条目数超过 max_entries 或估算的总字节数超过 max_bytes 时淘汰最久未用的条目
+- 每个算法各自缓存解与 SolveStats（键中带算法名），命中时返回原来那次求解的统计信息
+  （包括时间），界面上的算法对比结果因此保持不变
+
+CachedSolver 包装任意求解器（MRVLCVSolver / AC3_MRV_LCV_Solver / DLXSolver / SudokuSolver），
+接口与被包装的求解器相同；命中时若设置了 fill_cb，按 is_try=False 依次回放填入的格子。
+cached(solver) 用进程内共用的一个缓存（shared_cache()，第一次用到时才创建）包装求解器，供界面使用。
+"""
+
+import copy
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Hashable, List, Optional, Tuple
+
+from src.algorithms.flat_board import FlatBoard
+from src.generator.transforms import Transform, minlex
+
+Board = List[List[int]]  # NxN（默认 9x9）, 0 表示空格
+
+KEY_MODES = ("board", "canonical")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # 命中次数
+    misses: int = 0  # 未命中次数
+    evictions: int = 0  # 被淘汰的条目数
+
+
+class SolutionCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 4 << 20, key: str = "board"):
+        """
+        :param max_entries: 最多保存的条目数
+        :param max_bytes: 条目（键 + 解 + 统计信息）估算总字节数的上限
+        :param key: "board"（按盘面精确匹配）或 "canonical"（等价题目共用）
+        """
+        if key not in KEY_MODES:
+            raise ValueError(f"key 必须是: {list(KEY_MODES)}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.key_mode = key
+        self.stats = CacheStats()
+        self.nbytes = 0
+        # 键 -> (规范坐标下的解, SolveStats, 条目字节数)；末尾为最近使用
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def key_of(self, board: Board, namespace: str = "") -> Tuple[Hashable, Optional[Transform]]:
+        """返回 (缓存键, 盘面 -> 规范形式的变换)；key="board" 时变换为 None。"""
+        if self.key_mode == "canonical":
+            form, transform = minlex(board)
+            return (namespace, form), transform
+        return (namespace, bytes(v for row in board for v in row)), None
+
+    def get(self, key: Hashable, transform: Optional[Transform] = None) -> Optional[Tuple[Board, Any]]:
+        """查找缓存，命中时返回 (映射回原盘面的解, SolveStats 副本)，否则返回 None。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        data, stats, _ = entry
+        solution = FlatBoard.from_flat(data).to_rows()
+        if transform is not None:
+            solution = transform.invert().apply(solution)
+        return solution, copy.copy(stats)
+
+    def put(self, key: Hashable, solution: Board, stats: Any, transform: Optional[Transform] = None) -> None:
+        """保存一个解（transform 为 key_of 返回的变换）；单个条目超过 max_bytes 时不缓存。"""
+        if transform is not None:
+            solution = transform.apply(solution)
+        data = bytes(v for row in solution for v in row)
+        size = sys.getsizeof(key[1]) + sys.getsizeof(data) + sys.getsizeof(stats)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[2]
+        self._entries[key] = (data, copy.copy(stats), size)
+        self.nbytes += size
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+            self.stats.evictions += 1
+
+
+class CachedSolver:
+    """在任意求解器前加一层解缓存；其它属性与方法都转发给被包装的求解器。"""
+
+    def __init__(self, solver, cache: Optional[SolutionCache] = None):
+        self.solver = solver
+        self.cache = cache if cache is not None else SolutionCache()
+        # 不同算法的统计信息不同，各自占用一组键
+        self.algorithm = type(solver).__name__
+        self.hits = 0
+        self.misses = 0
+        self.last_hit = False  # 最近一次 solve 是否命中缓存
+        self._stats = None
+        self._fill_cb = None
+
+    def __getattr__(self, name):
+        if name == "solver":  # 尚未初始化（如 copy / pickle 过程中）
+            raise AttributeError(name)
+        return getattr(self.solver, name)
+
+    @property
+    def stats(self):
+        return self._stats if self.last_hit else self.solver.stats
+
+    def set_animation_callbacks(self, fill_cb=None, backtrack_cb=None, ac3_prune_cb=None):
+        """设置动画回调函数（命中缓存时只回放 fill_cb）"""
+        self._fill_cb = fill_cb
+        self.solver.set_animation_callbacks(fill_cb, backtrack_cb, ac3_prune_cb)
+
+    def solve(self, board: Board, *args, **kwargs) -> Optional[Board]:
+        # 基础 DFS 会原地修改输入，必须在求解前算出键和空格位置
+        key, transform = self.cache.key_of(board, self.algorithm)
+        empties = [(r, c) for r, row in enumerate(board) for c, v in enumerate(row) if v == 0]
+        cached = self.cache.get(key, transform)
+        if cached is None:
+            self.misses += 1
+            self.last_hit = False
+            solution = self.solver.solve(board, *args, **kwargs)
+            if solution is not None:
+                self.cache.put(key, solution, self.solver.stats, transform)
+            return solution
+
+        self.hits += 1
+        self.last_hit = True
+        solution, self._stats = cached
+        if self._fill_cb:
+            for r, c in empties:
+                self._fill_cb(r, c, solution[r][c], is_try=False)
+        if isinstance(board, FlatBoard):
+            return FlatBoard.from_rows(solution)
+        return solution
+
+
+@lru_cache(maxsize=None)
+def shared_cache() -> SolutionCache:
+    """进程内共用的解缓存：切换算法、重复点击 "对比算法" 时直接返回缓存的解和统计信息。"""
+    return SolutionCache()
+
+
+def cached(solver) -> CachedSolver:
+    """用 shared_cache() 包装求解器。"""
+    return CachedSolver(solver, shared_cache())
+
+
+if __name__ == "__main__":
+    from src.algorithms.solver_dlx import DLXSolver
+    from src.generator.transforms import random_isomorph
+
+    puzzle = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    solver = CachedSolver(DLXSolver(), SolutionCache(key="canonical"))
+    solver.solve(puzzle)
+    shuffled = random_isomorph(puzzle)
+    solution = solver.solve(shuffled)
+    print("等价题命中:", solver.last_hit, "解正确:",
+          all(v == 0 or v == s for row, srow in zip(shuffled, solution) for v, s in zip(row, srow)))
+    print("缓存统计:", solver.cache.stats, "字节数:", solver.cache.nbytes)
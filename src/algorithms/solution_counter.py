@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+带上限的快速解计数（用于唯一性判断）。
+
+- 行 / 列 / 宫已用数字用位掩码维护，候选 = 一次 OR 再取反
+- MRV：每层选候选最少的空格，遇到 0 个候选立即剪枝，遇到 1 个候选立即选中
+- 找到 limit 个解后立即停止（唯一性判断只需要 limit = 2）
+
+生成器挖洞时每挖一次都要判断一次唯一性，这里的开销直接决定生成速度。
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+import time
+
+from src.algorithms.geometry import board_geometry, box_size_of
+from src.algorithms.search_engine import DepthFirstSearch
+
+Board = List[List[int]]  # NxN（默认 9x9）, 0 表示空格
+
+
+@dataclass
+class CountStats:
+    nodes: int = 0  # 搜索节点数（尝试赋值次数）
+    solutions: int = 0  # 找到的解数（不超过 limit）
+    count_time: float = 0.0  # 计数时间（秒）
+
+
+class SolutionCounter:
+    def __init__(self, box_size: int = 3):
+        self.stats = CountStats()
+        self.box_size = box_size
+        self.size = box_size * box_size
+        geo = board_geometry(box_size)
+        self._all_digits = geo.all_digits
+        self._popcount = geo.popcount
+        self._box_of = geo.box_of
+        # 增量唯一性判断用（平时全为 0）：每格额外禁止的数字 / 优先尝试的数字
+        self._forbid = [0] * geo.cells
+        self._prefer = [0] * geo.cells
+
+    def count(self, board: Board, limit: int = 2) -> int:
+        """
+        统计 board 的解数，找到 limit 个后停止；不修改 board。
+        已知数互相冲突时返回 0。
+        """
+        self.stats = CountStats()
+        start_time = time.time()
+        if self._setup(board):
+            self._limit = limit
+            self._search(len(self._empties))
+        self.stats.count_time = time.time() - start_time
+        return self.stats.solutions
+
+    def has_other_solution(self, board: Board, solution: Board, cells: List[Tuple[int, int]]) -> bool:
+        """
+        增量唯一性判断（用于挖洞）：已知 solution 是 board 的解，且挖掉 cells 之前
+        盘面只有这一个解，那么任何别的解都必然在 cells 中某格与 solution 不同。
+        因此依次禁止每个 cells 格子取 solution 的值，找一个解即可（limit = 1）；
+        已经排除的格子在检查后续格子时固定为 solution 的值。
+        这样跳过了 "先找到 solution 本身" 的那条路径，也不会重复搜索。不修改 board。
+        """
+        self.stats = CountStats()
+        start_time = time.time()
+        found = False
+        if self._setup(board):
+            self._limit = 1
+            n = self.size
+            forbid = self._forbid
+            row_used, col_used, box_used = self._row_used, self._col_used, self._box_used
+            # 别的解通常只在一小组格子上与 solution 不同，其余格子优先尝试 solution 的值
+            prefer = self._prefer
+            for i, v in enumerate(v for row in solution for v in row):
+                prefer[i] = 1 << (v - 1)
+            for (r, c) in cells:
+                i = r * n + c
+                keep = 1 << (solution[r][c] - 1)
+                # 禁止该格取 solution 的值，其余交给正常的 MRV 搜索
+                forbid[i] = keep
+                self._search(len(self._empties))
+                forbid[i] = 0
+                if self.stats.solutions:
+                    found = True
+                    break
+                # 该格取其它数字都无解，检查后面的格子时直接固定为 solution 的值
+                self._empties.remove(i)
+                row_used[r] |= keep
+                col_used[c] |= keep
+                box_used[self._box_of[i]] |= keep
+            self._prefer = [0] * len(prefer)
+        self.stats.count_time = time.time() - start_time
+        return found
+
+    def _setup(self, board: Board) -> bool:
+        """建立行/列/宫已用掩码与空格列表；已知数互相冲突时返回 False。"""
+        n = self.size
+        box_of = self._box_of
+        row_used = [0] * n
+        col_used = [0] * n
+        box_used = [0] * n
+        empties: List[int] = []
+        for r in range(n):
+            for c in range(n):
+                v = board[r][c]
+                if v == 0:
+                    empties.append(r * n + c)
+                    continue
+                bit = 1 << (v - 1)
+                b = box_of[r * n + c]
+                if (row_used[r] | col_used[c] | box_used[b]) & bit:
+                    return False
+                row_used[r] |= bit
+                col_used[c] |= bit
+                box_used[b] |= bit
+
+        self._row_used, self._col_used, self._box_used = row_used, col_used, box_used
+        self._empties = empties
+        return True
+
+    def _search(self, k: int) -> None:
+        """empties[:k] 为尚未填写的空格；在显式栈上搜索（search_engine.DepthFirstSearch）。"""
+        self._k = k
+        DepthFirstSearch(self._expand).run()
+
+    def _expand(self) -> Optional[Iterator[None]]:
+        """展开一个搜索节点（empties[:self._k] 为尚未填写的空格）；记下一个解或遇到死路时返回 None。"""
+        k = self._k
+        if k == 0:
+            self.stats.solutions += 1
+            return None
+
+        n = self.size
+        all_digits = self._all_digits
+        popcount = self._popcount
+        box_of = self._box_of
+        row_used, col_used, box_used = self._row_used, self._col_used, self._box_used
+        forbid = self._forbid
+        empties = self._empties
+
+        # MRV：候选最少的空格
+        best_j, best_mask, best_count = -1, 0, n + 1
+        for j in range(k):
+            i = empties[j]
+            mask = all_digits & ~(row_used[i // n] | col_used[i % n] | box_used[box_of[i]] | forbid[i])
+            count = popcount(mask)
+            if count < best_count:
+                best_j, best_mask, best_count = j, mask, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            return None
+
+        # 把选中的格子换到末尾，下一层只看前 k - 1 个
+        i = empties[best_j]
+        empties[best_j], empties[k - 1] = empties[k - 1], i
+        return self._branches(k, i, best_mask)
+
+    def _branches(self, k: int, i: int, mask: int) -> Iterator[None]:
+        """依次给格子 i 填 mask 中的数字，每填一个 yield 一次；解数达到 limit 后不再尝试。"""
+        n = self.size
+        r, c, b = i // n, i % n, self._box_of[i]
+        row_used, col_used, box_used = self._row_used, self._col_used, self._box_used
+        stats = self.stats
+        prefer = self._prefer[i]
+        while mask:
+            bit = prefer & mask or mask & -mask
+            mask ^= bit
+            stats.nodes += 1
+            row_used[r] |= bit
+            col_used[c] |= bit
+            box_used[b] |= bit
+            self._k = k - 1
+            yield
+            row_used[r] &= ~bit
+            col_used[c] &= ~bit
+            box_used[b] &= ~bit
+            if stats.solutions >= self._limit:
+                break
+
+
+def count_solutions(board: Board, limit: int = 2) -> int:
+    """统计解数（找到 limit 个后停止）；盘面大小由 board 推断。"""
+    return SolutionCounter(box_size_of(board)).count(board, limit)
+
+
+if __name__ == "__main__":
+    puzzle = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    counter = SolutionCounter()
+    print("解数:", counter.count(puzzle), counter.stats)
+    puzzle[0][0] = 0
+    puzzle[0][1] = 0
+    print("去掉两个提示后（最多数 10 个）:", counter.count(puzzle, limit=10), counter.stats)
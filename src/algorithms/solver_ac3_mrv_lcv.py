@@ -10,15 +10,46 @@ Sudoku solver using AC-3 + MRV + LCV.
 "AC-3 + MRV + LCV" 算法选项。
 """
 
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Tuple, Set, List, Optional
-from copy import deepcopy
+from functools import lru_cache, partial
+from typing import Dict, Iterator, Tuple, Set, List, Optional
 import time
 
-Board = List[List[int]]  # 9x9, 0 表示空格
+from src.algorithms.flat_board import copy_board
+from src.algorithms.geometry import board_geometry
+from src.algorithms.propagation import compute_candidates, propagate
+from src.algorithms.search_engine import SOLVED, DepthFirstSearch
+
+Board = List[List[int]]  # NxN（默认 9x9）, 0 表示空格
 Var = Tuple[int, int]  # (row, col)
 
 
+@lru_cache(maxsize=None)
+def _arc_tables(box_size: int = 3):
+    """
+    预先计算邻居表与弧表（按盘面大小缓存）：
+    - peers: var -> 与之有约束关系的全部变量（同行、同列、同宫）
+    - arcs: 全部弧 (Xi, Xj)，用下标表示以便用标志数组去重
+    - arcs_into: 指向 var 的弧下标，var -> [id(Xk, var), ...]
+    """
+    geo = board_geometry(box_size)
+    n = geo.size
+    peers: Dict[Var, Tuple[Var, ...]] = {
+        divmod(i, n): tuple(divmod(p, n) for p in geo.peers[i])
+        for i in range(geo.cells)
+    }
+    arcs: List[Tuple[Var, Var]] = [(xi, xj) for xi in peers for xj in peers[xi]]
+    arcs_into: Dict[Var, List[int]] = {var: [] for var in peers}
+    for arc_id, (_, xi) in enumerate(arcs):
+        arcs_into[xi].append(arc_id)
+    return peers, arcs, arcs_into
+
+
+# 9x9 盘面的邻居表与弧表
+PEERS, ARCS, ARCS_INTO = _arc_tables(3)
+
+
 @dataclass
 class SolveStats:
     nodes: int = 0  # 尝试赋值的次数
@@ -27,11 +58,18 @@ class SolveStats:
     domain_reductions: int = 0  # 候选值削减次数
     solve_time: float = 0.0  # 求解时间（秒，包含动画）
     pure_solve_time: float = 0.0  # 纯算法时间（秒，不包含动画）
+    propagated: int = 0  # 约束传播直接推出的格子数
 
 
 class AC3_MRV_LCV_Solver:
-    def __init__(self):
+    def __init__(self, use_propagation: bool = False, box_size: int = 3):
         self.stats = SolveStats()
+        # 宫的边长：3 -> 9x9，4 -> 16x16，5 -> 25x25
+        self.box_size = box_size
+        self.size = box_size * box_size
+        self._peers, self._arcs, self._arcs_into = _arc_tables(box_size)
+        # 是否在 AC-3 之前先做单数/区块排除传播
+        self.use_propagation = use_propagation
         self._solution: Optional[Board] = None
         # 动画回调函数
         self._fill_cb = None
@@ -39,6 +77,8 @@ class AC3_MRV_LCV_Solver:
         self._ac3_prune_cb = None
         # 纯算法时间累计
         self._pure_time_start = 0.0
+        # 撤销日志：(变量, 被替换前的 domain)，回溯时倒序恢复
+        self._trail: List[Tuple[Var, Set[int]]] = []
 
     def set_animation_callbacks(self, fill_cb=None, backtrack_cb=None, ac3_prune_cb=None):
         """设置动画回调函数"""
@@ -48,29 +88,46 @@ class AC3_MRV_LCV_Solver:
 
     # ------------ 外部主接口 ------------
 
-    def solve(self, board: Board) -> Optional[Board]:
+    def solve(self, board: Board, candidates: Optional[List[int]] = None) -> Optional[Board]:
         """
         使用 AC-3 + MRV + LCV 求解数独。
-        :param board: 9x9 棋盘，0 表示空格
-        :return: 若有解，返回 9x9 解盘；否则返回 None
+        :param board: NxN（默认 9x9）棋盘，0 表示空格
+        :param candidates: 可选的候选掩码（长度 N*N，已填格子为 0），例如
+                           batch_candidates.analyze_boards 的结果；给出时直接用它初始化 domain
+        :return: 若有解，返回解盘；否则返回 None
         """
         self.stats = SolveStats()
         self._solution = None
         self._animation_time = 0.0  # 累计动画时间
+        self._trail = []
 
         start_time = time.time()
+        work_board = copy_board(board)
+
+        # 可选：先做单数/区块排除传播，并用传播后的候选集初始化 domain
+        if candidates is not None:
+            candidates = list(candidates)  # 传播会原地修改掩码，不动调用方的数据
+        if self.use_propagation:
+            if candidates is None:
+                candidates = compute_candidates(work_board)
+            if candidates is None or not self._propagate(work_board, candidates):
+                self.stats.solve_time = time.time() - start_time
+                self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
+                return None
 
         # 初始化 domain（每个格子的候选集）
-        domains = self._init_domains(board)
+        domains = self._init_domains(work_board, candidates)
 
         # 先跑一遍全局 AC-3 进行约束传播
-        if not self._ac3(board, domains):
+        if not self._ac3(work_board, domains):
             self.stats.solve_time = time.time() - start_time
             self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
             return None
 
+        # 初始传播不需要撤销，清空日志
+        self._trail.clear()
+
         # 回溯 + MRV + LCV
-        work_board = deepcopy(board)
         success = self._backtrack(work_board, domains)
         self.stats.solve_time = time.time() - start_time
         self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
@@ -81,22 +138,41 @@ class AC3_MRV_LCV_Solver:
 
     # ------------ 初始化候选集 ------------
 
-    def _init_domains(self, board: Board) -> Dict[Var, Set[int]]:
+    def _init_domains(self, board: Board,
+                      candidates: Optional[List[int]] = None) -> Dict[Var, Set[int]]:
         """
         根据当前棋盘初始化每个格子的候选集合。
         已有数字的格子 domain = {该数字}
         空格的 domain = 去掉行/列/宫中已用数字
+        若给出 candidates（长度 81 的候选掩码），空格直接取掩码中的数字。
         """
+        n = self.size
         domains: Dict[Var, Set[int]] = {}
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] == 0:
+        for r in range(n):
+            for c in range(n):
+                if board[r][c] == 0 and candidates is not None:
+                    mask = candidates[r * n + c]
+                    domains[(r, c)] = {v for v in range(1, n + 1) if mask >> (v - 1) & 1}
+                elif board[r][c] == 0:
                     used = self._used_in_peers(board, r, c)
-                    domains[(r, c)] = {v for v in range(1, 10) if v not in used}
+                    domains[(r, c)] = {v for v in range(1, n + 1) if v not in used}
                 else:
                     domains[(r, c)] = {board[r][c]}
         return domains
 
+    def _propagate(self, board: Board, candidates: List[int]) -> bool:
+        """搜索前的约束传播；推出的格子按“最终确定”通知动画。发现矛盾返回 False。"""
+        placed = propagate(board, candidates)
+        if placed is None:
+            return False
+        self.stats.propagated = len(placed)
+        if self._fill_cb:
+            anim_start = time.time()
+            for row, col, val in placed:
+                self._fill_cb(row, col, val, is_try=False)
+            self._animation_time += (time.time() - anim_start)
+        return True
+
     def _used_in_peers(self, board: Board, row: int, col: int) -> Set[int]:
         """
         返回 (row, col) 所在 行/列/宫 中已经用过的数字。
@@ -104,17 +180,18 @@ class AC3_MRV_LCV_Solver:
         used = set()
 
         # 行和列
-        for i in range(9):
+        for i in range(self.size):
             if board[row][i] != 0:
                 used.add(board[row][i])
             if board[i][col] != 0:
                 used.add(board[i][col])
 
         # 宫
-        br = (row // 3) * 3
-        bc = (col // 3) * 3
-        for r in range(br, br + 3):
-            for c in range(bc, bc + 3):
+        b = self.box_size
+        br = (row // b) * b
+        bc = (col // b) * b
+        for r in range(br, br + b):
+            for c in range(bc, bc + b):
                 if board[r][c] != 0:
                     used.add(board[r][c])
 
@@ -130,51 +207,56 @@ class AC3_MRV_LCV_Solver:
         """
         self.stats.ac3_calls += 1
 
-        queue: List[Tuple[Var, Var]] = []
-
         # 初始化队列：所有有约束关系的变量对 (Xi, Xj)
-        vars_list = list(domains.keys())
-        for xi in vars_list:
-            for xj in self._neighbors(xi):
-                if xj in domains:
-                    queue.append((xi, xj))
+        queue = deque(range(len(self._arcs)))
+        in_queue = bytearray(b"\x01") * len(self._arcs)
+        return self._drain_arcs(domains, queue, in_queue)
+
+    def _ac3_from(self, domains: Dict[Var, Set[int]], changed: List[Var]) -> bool:
+        """
+        增量 AC-3：只从 domain 刚被修改的变量出发传播。
+        前提是修改之前 domains 已经弧一致，此时只有指向 changed 的弧 (Xk, X)
+        可能失去支撑，结果与整盘重新跑 _ac3 相同。
+        """
+        self.stats.ac3_calls += 1
 
+        arcs_into = self._arcs_into
+        queue = deque()
+        in_queue = bytearray(len(self._arcs))
+        for var in changed:
+            for k in arcs_into[var]:
+                if not in_queue[k]:
+                    in_queue[k] = 1
+                    queue.append(k)
+        return self._drain_arcs(domains, queue, in_queue)
+
+    def _drain_arcs(self, domains: Dict[Var, Set[int]],
+                    queue: deque, in_queue: bytearray) -> bool:
+        """
+        处理弧队列直到为空。若某变量 domain 被削减为空，返回 False。
+        """
+        arcs, arcs_into = self._arcs, self._arcs_into
         while queue:
-            xi, xj = queue.pop(0)
+            arc_id = queue.popleft()
+            in_queue[arc_id] = 0
+            xi, xj = arcs[arc_id]
             if self._revise(domains, xi, xj):
                 # 如果修剪后 domain 为空，说明无解
                 if len(domains[xi]) == 0:
                     return False
-                # 若 Xi 的 domain 被修改，则 Xi 的其他邻居需重新检查
-                for xk in self._neighbors(xi):
-                    if xk != xj and xk in domains:
-                        queue.append((xk, xi))
+                # 若 Xi 的 domain 被修改，则 Xi 的其他邻居需重新检查（已在队列中的弧不重复入队）
+                for k in arcs_into[xi]:
+                    if not in_queue[k] and arcs[k][0] != xj:
+                        in_queue[k] = 1
+                        queue.append(k)
 
         return True
 
-    def _neighbors(self, var: Var) -> List[Var]:
+    def _neighbors(self, var: Var) -> Tuple[Var, ...]:
         """
         返回与 var 有约束关系的所有变量（同行、同列、同宫）。
         """
-        (row, col) = var
-        neighs: Set[Var] = set()
-
-        # 行和列
-        for i in range(9):
-            if i != col:
-                neighs.add((row, i))
-            if i != row:
-                neighs.add((i, col))
-
-        # 宫
-        br = (row // 3) * 3
-        bc = (col // 3) * 3
-        for r in range(br, br + 3):
-            for c in range(bc, bc + 3):
-                if not (r == row and c == col):
-                    neighs.add((r, c))
-
-        return list(neighs)
+        return self._peers[var]
 
     def _revise(self, domains: Dict[Var, Set[int]], xi: Var, xj: Var) -> bool:
         """
@@ -185,15 +267,17 @@ class AC3_MRV_LCV_Solver:
         返回 True 表示 xi 的 domain 被修改。
         """
         revised = False
-        to_remove = set()
+        dj = domains[xj]
 
-        for x in domains[xi]:
-            # 检查 xj 的 domain 中是否存在 y != x
-            # 如果不存在，则 x 不可用（否则 xi=xj 违反约束）
-            if not any(y != x for y in domains[xj]):
-                to_remove.add(x)
+        # 只要 xj 还有两个以上候选，xi 的任何值都能找到 y != x 的支撑
+        if len(dj) > 1:
+            return False
+        # xj 只剩一个值时，只有这个值在 xi 中失去支撑（xj 为空则全部失去支撑）
+        to_remove = dj & domains[xi] if dj else set(domains[xi])
 
         if to_remove:
+            # revise 总是生成新集合，日志里只需保存旧集合的引用
+            self._trail.append((xi, domains[xi]))
             domains[xi] = domains[xi] - to_remove
             revised = True
             self.stats.domain_reductions += len(to_remove)
@@ -211,60 +295,83 @@ class AC3_MRV_LCV_Solver:
         """
         在已经经过 AC-3 约束传播后的 domains 上进行
         回溯搜索，使用 MRV + LCV。
+        每层的分支由 _branches 生成器给出，交给 search_engine.DepthFirstSearch 的显式栈推进。
         """
+        return DepthFirstSearch(partial(self._expand, board, domains)).run()
+
+    def _expand(self, board: Board, domains: Dict[Var, Set[int]]):
+        """展开一个搜索节点：找到解返回 SOLVED，剪枝返回 None，否则返回各候选分支。"""
         # 选择一个未赋值的变量（空格）——使用 MRV
         mrv_var = self._select_mrv_variable(board, domains)
         if mrv_var is None:
             # 所有格子都有单一值，说明已找到解
-            self._solution = deepcopy(board)
+            self._solution = copy_board(board)
             # 不再重新填充所有数字，因为在回溯过程中已经填充了
-            return True
-
-        (row, col) = mrv_var
-        values = domains[(row, col)]
+            return SOLVED
 
+        values = domains[mrv_var]
         if not values:
-            return False
+            return None
+        return self._branches(board, domains, mrv_var, values)
 
+    def _branches(self, board: Board, domains: Dict[Var, Set[int]],
+                  var: Var, values: Set[int]) -> Iterator[None]:
+        """
+        按 LCV 顺序依次给 var 赋值并做局部 AC-3；传播没有冲突时 yield，
+        由搜索核心展开下一层。
+        """
         # 按 LCV 对候选值排序
-        ordered_values = self._order_values_lcv(board, domains, mrv_var, values)
+        ordered_values = self._order_values_lcv(board, domains, var, values)
 
+        (row, col) = var
+        # 生成器在各分支之间保留局部变量，这些属性只需取一次
+        stats = self.stats
+        trail = self._trail
+        board_row = board[row]
+        fill_cb, backtrack_cb = self._fill_cb, self._backtrack_cb
+        changed = [var]
         for val in ordered_values:
-            self.stats.nodes += 1
+            stats.nodes += 1
 
-            # 备份当前 board 与 domains，用于回溯
-            board_backup = board[row][col]
-            domains_backup = deepcopy(domains)
+            # 记录撤销日志位置，回溯时只恢复本节点之后被修改的 domain
+            board_backup = board_row[col]
+            mark = len(trail)
 
             # 赋值
-            board[row][col] = val
-            domains[(row, col)] = {val}
-            
+            board_row[col] = val
+            trail.append((var, domains[var]))
+            domains[var] = {val}
+
             # 动画：尝试填入（蓝色）
-            if self._fill_cb:
+            if fill_cb:
                 anim_start = time.time()
-                self._fill_cb(row, col, val, is_try=True)
+                fill_cb(row, col, val, is_try=True)
                 self._animation_time += (time.time() - anim_start)
 
-            # 对该赋值执行局部 AC-3 约束传播
-            if self._ac3(board, domains):
-                # 若未导致冲突，递归求解
-                if self._backtrack(board, domains):
-                    return True
+            # 对该赋值执行局部 AC-3 约束传播（只从刚赋值的格子出发）
+            if self._ac3_from(domains, changed):
+                # 若未导致冲突，进入下一层（找到解时搜索核心直接停止，不再回到这里）
+                yield
 
             # 回溯
-            board[row][col] = board_backup
-            domains.clear()
-            domains.update(domains_backup)
-            self.stats.backtracks += 1
-            
+            board_row[col] = board_backup
+            self._undo(domains, mark)
+            stats.backtracks += 1
+
             # 动画：回溯撤销（红色闪烁）
-            if self._backtrack_cb:
+            if backtrack_cb:
                 anim_start = time.time()
-                self._backtrack_cb(row, col)
+                backtrack_cb(row, col)
                 self._animation_time += (time.time() - anim_start)
 
-        return False
+    def _undo(self, domains: Dict[Var, Set[int]], mark: int) -> None:
+        """
+        把撤销日志回退到 mark 位置：倒序把每个变量的 domain 恢复为修改前的集合。
+        """
+        trail = self._trail
+        while len(trail) > mark:
+            var, old_domain = trail.pop()
+            domains[var] = old_domain
 
     def _select_mrv_variable(
             self,
@@ -274,9 +381,11 @@ class AC3_MRV_LCV_Solver:
         """
         MRV: 从所有尚未确定的格子中，选择 domain 大小最小的一个。
         若所有格子都已确定（domain size == 1 且无 0），返回 None。
+        AC-3 每个节点都会改动很多格子的 domain，维护分桶（见 MRVBuckets）的开销抵消了省下的扫描，
+        这里保留逐格扫描，见 benchmarks/bench_mrv.py。
         """
         best_var: Optional[Var] = None
-        best_size = 10  # 大于最大候选数 9
+        best_size = self.size + 1  # 大于最大候选数
 
         for (r, c), dom in domains.items():
             if board[r][c] == 0:
@@ -6,11 +6,15 @@ This version adds initial board validation to ensure the input is legal.
 Now includes statistics tracking for performance comparison.
 """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from dataclasses import dataclass
+from functools import partial
 import time
 
-Board = List[List[int]]  # 9x9 Sudoku board, where 0 means empty
+from src.algorithms.propagation import propagate
+from src.algorithms.search_engine import SOLVED, DepthFirstSearch
+
+Board = List[List[int]]  # NxN Sudoku board (9x9 by default), where 0 means empty
 
 
 @dataclass
@@ -20,11 +24,19 @@ class SolveStats:
     backtracks: int = 0  # 回溯次数
     solve_time: float = 0.0  # 求解时间（秒，包含动画）
     pure_solve_time: float = 0.0  # 纯算法时间（秒，不包含动画）
+    propagated: int = 0  # 约束传播直接推出的格子数
 
 
 class SudokuSolver:
-    def __init__(self):
+    def __init__(self, use_propagation: bool = False, box_size: int = 3, verbose: bool = True):
         self.stats = SolveStats()
+        # 是否在求解失败时打印提示（批量求解时关闭）
+        self.verbose = verbose
+        # 宫的边长：3 -> 9x9，4 -> 16x16，5 -> 25x25
+        self.box_size = box_size
+        self.size = box_size * box_size
+        # 是否在搜索前先做单数/区块排除传播
+        self.use_propagation = use_propagation
         # 动画回调函数
         self._fill_cb = None
         self._backtrack_cb = None
@@ -44,11 +56,18 @@ class SudokuSolver:
         
         # 1. First, validate the initial board (no duplicates in rows/columns/boxes)
         if not self._is_board_valid(board):
-            print("Initial board is invalid (duplicates exist).")
+            if self.verbose:
+                print("Initial board is invalid (duplicates exist).")
             return None
         
         # 2. Proceed with backtracking only if the initial board is legal
         start_time = time.time()
+        if self.use_propagation and not self._propagate(board):
+            self.stats.solve_time = time.time() - start_time
+            self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
+            if self.verbose:
+                print("No solution found.")
+            return None
         if self._backtrack(board):
             self.stats.solve_time = time.time() - start_time
             self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
@@ -56,9 +75,23 @@ class SudokuSolver:
         
         self.stats.solve_time = time.time() - start_time
         self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
-        print("No solution found.")
+        if self.verbose:
+            print("No solution found.")
         return None
 
+    def _propagate(self, board: Board) -> bool:
+        """Fill forced cells (singles, locked candidates) before searching. Returns False on contradiction."""
+        placed = propagate(board)
+        if placed is None:
+            return False
+        self.stats.propagated = len(placed)
+        if self._fill_cb:
+            anim_start = time.time()
+            for row, col, num in placed:
+                self._fill_cb(row, col, num, is_try=False)
+            self._animation_time += (time.time() - anim_start)
+        return True
+
     def _is_board_valid(self, board: Board) -> bool:
         """Check if the initial board follows Sudoku rules (no duplicates in rows/columns/boxes)."""
         # Check rows
@@ -71,24 +104,25 @@ class SudokuSolver:
                     seen.add(num)
 
         # Check columns
-        for col in range(9):
+        n, b = self.size, self.box_size
+        for col in range(n):
             seen = set()
-            for row in range(9):
+            for row in range(n):
                 num = board[row][col]
                 if num != 0:
                     if num in seen:
                         return False
                     seen.add(num)
 
-        # Check 3x3 boxes
-        for box_row in range(3):  # 0-2 for top/middle/bottom boxes
-            for box_col in range(3):  # 0-2 for left/middle/right boxes
+        # Check boxes
+        for box_row in range(b):  # 0..b-1 for top..bottom boxes
+            for box_col in range(b):  # 0..b-1 for left..right boxes
                 seen = set()
-                start_r = box_row * 3
-                start_c = box_col * 3
-                # Iterate through each cell in the 3x3 box
-                for r in range(start_r, start_r + 3):
-                    for c in range(start_c, start_c + 3):
+                start_r = box_row * b
+                start_c = box_col * b
+                # Iterate through each cell in the box
+                for r in range(start_r, start_r + b):
+                    for c in range(start_c, start_c + b):
                         num = board[r][c]
                         if num != 0:
                             if num in seen:
@@ -97,41 +131,49 @@ class SudokuSolver:
         return True
 
     def _backtrack(self, board: Board) -> bool:
+        """DFS on an explicit stack (search_engine.DepthFirstSearch), so deep boards never hit the recursion limit."""
+        return DepthFirstSearch(partial(self._expand, board)).run()
+
+    def _expand(self, board: Board):
         empty_cell = self._find_empty_cell(board)
         if not empty_cell:
             # 不再重新填充所有数字，因为在回溯过程中已经填充了
-            return True  # Solved
+            return SOLVED  # Solved
 
         row, col = empty_cell
-
-        for num in range(1, 10):
+        return self._branches(board, row, col)
+
+    def _branches(self, board: Board, row: int, col: int) -> Iterator[None]:
+        """Try each valid number at (row, col); yield after every placement so the engine can go one level deeper."""
+        stats = self.stats
+        board_row = board[row]
+        fill_cb, backtrack_cb = self._fill_cb, self._backtrack_cb
+        for num in range(1, self.size + 1):
             if self._is_valid(board, row, col, num):
-                self.stats.nodes += 1  # 统计尝试次数
-                board[row][col] = num
-                
+                stats.nodes += 1  # 统计尝试次数
+                board_row[col] = num
+
                 # 动画：尝试填入（蓝色）
-                if self._fill_cb:
+                if fill_cb:
                     anim_start = time.time()
-                    self._fill_cb(row, col, num, is_try=True)
+                    fill_cb(row, col, num, is_try=True)
                     self._animation_time += (time.time() - anim_start)
-                
-                if self._backtrack(board):
-                    return True
-                
-                board[row][col] = 0  # Backtrack
-                self.stats.backtracks += 1  # 统计回溯次数
-                
+
+                yield
+
+                board_row[col] = 0  # Backtrack
+                stats.backtracks += 1  # 统计回溯次数
+
                 # 动画：回溯撤销（红色闪烁）
-                if self._backtrack_cb:
+                if backtrack_cb:
                     anim_start = time.time()
-                    self._backtrack_cb(row, col)
+                    backtrack_cb(row, col)
                     self._animation_time += (time.time() - anim_start)
 
-        return False
-
     def _find_empty_cell(self, board: Board) -> Optional[tuple]:
-        for r in range(9):
-            for c in range(9):
+        n = self.size
+        for r in range(n):
+            for c in range(n):
                 if board[r][c] == 0:
                     return r, c
         return None
@@ -143,15 +185,16 @@ class SudokuSolver:
             return False
 
         # Check column
-        for r in range(9):
+        for r in range(self.size):
             if board[r][col] == num:
                 return False
 
         # Check box
-        box_row_start = (row // 3) * 3
-        box_col_start = (col // 3) * 3
-        for r in range(box_row_start, box_row_start + 3):
-            for c in range(box_col_start, box_col_start + 3):
+        b = self.box_size
+        box_row_start = (row // b) * b
+        box_col_start = (col // b) * b
+        for r in range(box_row_start, box_row_start + b):
+            for c in range(box_col_start, box_col_start + b):
                 if board[r][c] == num:
                     return False
 
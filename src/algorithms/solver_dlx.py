@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Sudoku solver using Dancing Links (Knuth's Algorithm X).
+
+把数独看作精确覆盖问题（以 9x9 为例，NxN 同理）：
+- 行（候选）：729 个 "在 (r, c) 填 v"
+- 列（约束）：324 个，分别是 格子有数 / 行含 v / 列含 v / 宫含 v
+每个候选恰好覆盖 4 个约束，解就是一组恰好覆盖全部 324 个约束的候选。
+
+链表用整数下标的平行数组实现（L/R/U/D/C/S），每次求解只复制一份模板，
+比逐个创建节点对象快得多。
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import time
+
+from src.algorithms.flat_board import FlatBoard
+
+Board = List[List[int]]  # NxN（默认 9x9）, 0 表示空格
+
+
+@dataclass
+class SolveStats:
+    nodes: int = 0  # 选择候选行的次数
+    backtracks: int = 0  # 回溯次数
+    solve_time: float = 0.0  # 求解时间（秒，包含动画）
+    pure_solve_time: float = 0.0  # 纯算法时间（秒，不包含动画）
+
+
+@lru_cache(maxsize=None)
+def _build_template(box_size: int = 3) -> Tuple[List[int], ...]:
+    """
+    构建完整（尚未覆盖任何列）的舞蹈链模板（按盘面大小缓存）。
+    节点 0 为表头，1..4*N*N 为列头，其后每个候选占 4 个节点。
+    """
+    n = box_size * box_size
+    cells = n * n
+    n_columns = 4 * cells  # 4 类约束 × N*N
+    L = [0] * (n_columns + 1)
+    R = [0] * (n_columns + 1)
+    U = list(range(n_columns + 1))
+    D = list(range(n_columns + 1))
+    C = list(range(n_columns + 1))
+    S = [0] * (n_columns + 1)
+    row_of = [-1] * (n_columns + 1)  # 节点 -> 候选编号 (r * N + c) * N + (v - 1)
+    first_node = [0] * (cells * n)  # 候选编号 -> 该候选的第一个节点
+
+    for i in range(n_columns + 1):
+        L[i] = i - 1 if i > 0 else n_columns
+        R[i] = i + 1 if i < n_columns else 0
+
+    for r in range(n):
+        for c in range(n):
+            b = (r // box_size) * box_size + c // box_size
+            for d in range(n):
+                rid = (r * n + c) * n + d
+                cols = (
+                    1 + r * n + c,
+                    1 + cells + r * n + d,
+                    1 + 2 * cells + c * n + d,
+                    1 + 3 * cells + b * n + d,
+                )
+                first = len(L)
+                first_node[rid] = first
+                for k, col in enumerate(cols):
+                    node = first + k
+                    # 横向：同一候选的 4 个节点成环
+                    L.append(first + (k - 1) % 4)
+                    R.append(first + (k + 1) % 4)
+                    # 纵向：挂到列的最底部
+                    U.append(U[col])
+                    D.append(col)
+                    D[U[col]] = node
+                    U[col] = node
+                    C.append(col)
+                    S[col] += 1
+                    row_of.append(rid)
+
+    return L, R, U, D, C, S, row_of, first_node
+
+
+class DLXSolver:
+    def __init__(self, box_size: int = 3):
+        self.stats = SolveStats()
+        # 宫的边长：3 -> 9x9，4 -> 16x16，5 -> 25x25
+        self.box_size = box_size
+        self.size = box_size * box_size
+        self._solution: Optional[Board] = None
+        # 动画回调函数
+        self._fill_cb = None
+        self._backtrack_cb = None
+        # 纯算法时间累计
+        self._pure_time_start = 0.0
+
+    def set_animation_callbacks(self, fill_cb=None, backtrack_cb=None, ac3_prune_cb=None):
+        """设置动画回调函数（DLX 没有候选削减阶段，忽略 ac3_prune_cb）"""
+        self._fill_cb = fill_cb
+        self._backtrack_cb = backtrack_cb
+
+    # ------------ 外部主接口 ------------
+
+    def solve(self, board: Board) -> Optional[Board]:
+        """
+        使用 DLX 求解数独。
+        :param board: NxN（默认 9x9）棋盘，0 表示空格
+        :return: 若有解，返回新的解盘；否则返回 None
+        """
+        self.stats = SolveStats()
+        self._solution = None
+        self._animation_time = 0.0  # 累计动画时间
+
+        start_time = time.time()
+        success = False
+        if self._setup(board):
+            self._count = 0
+            self._limit = 1
+            self._search()
+            success = self._count > 0
+        self.stats.solve_time = time.time() - start_time
+        self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
+
+        if success:
+            return self._solution
+        return None
+
+    def count_solutions(self, board: Board, limit: int = 2) -> int:
+        """
+        统计盘面的解的个数，数到 limit 个即停止。
+        常用 limit=2 判断唯一解：返回 1 表示唯一。
+        """
+        self.stats = SolveStats()
+        self._solution = None
+        self._animation_time = 0.0
+
+        start_time = time.time()
+        count = 0
+        if self._setup(board):
+            self._count = 0
+            self._limit = limit
+            self._search(record=False, animate=False)
+            count = self._count
+        self.stats.solve_time = time.time() - start_time
+        self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
+        return count
+
+    # ------------ 建表与覆盖 ------------
+
+    def _setup(self, board: Board) -> bool:
+        """
+        复制模板并选中所有已知数对应的候选行。
+        若已知数之间互相冲突（某个约束被覆盖两次），返回 False。
+        """
+        n = self.size
+        L, R, U, D, C, S, row_of, first_node = _build_template(self.box_size)
+        self._L, self._R, self._U, self._D = L[:], R[:], U[:], D[:]
+        self._C, self._S = C, S[:]
+        self._row_of = row_of
+        self._given = [board[r][c] for r in range(n) for c in range(n)]
+        self._flat_input = isinstance(board, FlatBoard)  # 解盘与输入保持同一类型
+        self._chosen: List[int] = []
+
+        covered = [False] * len(S)
+        for idx, v in enumerate(self._given):
+            if v == 0:
+                continue
+            node = first_node[idx * n + v - 1]
+            j = node
+            while True:
+                if covered[C[j]]:
+                    return False
+                covered[C[j]] = True
+                self._cover(C[j])
+                j = self._R[j]
+                if j == node:
+                    break
+        return True
+
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    # ------------ Algorithm X ------------
+
+    def _search(self, record: bool = True, animate: bool = True) -> bool:
+        """
+        Algorithm X：选择剩余行数最少的列（S 启发式），依次尝试覆盖它的各行。
+        找到的解数达到 self._limit 时返回 True 终止搜索。
+        不用递归：cols[k] 与 self._chosen[k] 是第 k 层覆盖的列和当前选中的行，
+        回溯时撤销栈顶的行并换同一列的下一行，该列的行用尽才出栈。
+        """
+        L, R, D, C, S = self._L, self._R, self._D, self._C, self._S
+        cover, uncover = self._cover, self._uncover
+        stats = self.stats
+        chosen = self._chosen
+        fill_cb = self._fill_cb if animate else None
+        backtrack_cb = self._backtrack_cb if animate else None
+        cols: List[int] = []
+
+        while True:
+            # r 为下一层要选中的行；0 是根节点，不会是候选行，用来表示需要回溯
+            r = 0
+            if R[0] == 0:
+                # 所有约束都被覆盖：找到一个解
+                self._count += 1
+                if record and self._solution is None:
+                    self._solution = self._decode()
+                if self._count >= self._limit:
+                    return True
+            else:
+                # 选择大小最小的列
+                best = 0
+                best_size = self.size + 1
+                j = R[0]
+                while j != 0:
+                    if S[j] < best_size:
+                        best, best_size = j, S[j]
+                        if best_size <= 1:
+                            break
+                    j = R[j]
+                if best_size > 0:
+                    cover(best)
+                    cols.append(best)
+                    r = D[best]
+
+            if r == 0:
+                # 回溯：按相反顺序恢复栈顶的行，换同一列的下一行
+                while cols:
+                    c = cols[-1]
+                    r = chosen.pop()
+                    j = L[r]
+                    while j != r:
+                        uncover(C[j])
+                        j = L[j]
+                    stats.backtracks += 1
+
+                    # 动画：回溯撤销（红色闪烁）
+                    if backtrack_cb:
+                        row, col, _ = self._cell_of(r)
+                        anim_start = time.time()
+                        backtrack_cb(row, col)
+                        self._animation_time += (time.time() - anim_start)
+
+                    r = D[r]
+                    if r != c:
+                        break
+                    uncover(c)
+                    cols.pop()
+                else:
+                    return False
+
+            # 选中行 r，进入下一层
+            stats.nodes += 1
+            chosen.append(r)
+            j = R[r]
+            while j != r:
+                cover(C[j])
+                j = R[j]
+
+            # 动画：尝试填入（蓝色）
+            if fill_cb:
+                row, col, val = self._cell_of(r)
+                anim_start = time.time()
+                fill_cb(row, col, val, is_try=True)
+                self._animation_time += (time.time() - anim_start)
+
+    def _cell_of(self, node: int) -> Tuple[int, int, int]:
+        """节点 -> (row, col, value)"""
+        n = self.size
+        rid = self._row_of[node]
+        cell, d = divmod(rid, n)
+        return cell // n, cell % n, d + 1
+
+    def _decode(self) -> Board:
+        """已知数 + 当前选中的候选 -> 完整盘面"""
+        n = self.size
+        flat = list(self._given)
+        for node in self._chosen:
+            rid = self._row_of[node]
+            flat[rid // n] = rid % n + 1
+        if self._flat_input:
+            return FlatBoard(bytearray(flat), n)
+        return [flat[r * n:(r + 1) * n] for r in range(n)]
+
+
+# ------------------- 示例使用 -------------------
+
+if __name__ == "__main__":
+    # 极难示例（需要更多回溯）
+    hard_board = [
+        [8, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 3, 6, 0, 0, 0, 0, 0],
+        [0, 7, 0, 0, 9, 0, 2, 0, 0],
+        [0, 5, 0, 0, 0, 7, 0, 0, 0],
+        [0, 0, 0, 0, 4, 5, 7, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0, 3, 0],
+        [0, 0, 1, 0, 0, 0, 0, 6, 8],
+        [0, 0, 8, 5, 0, 0, 0, 1, 0],
+        [0, 9, 0, 0, 0, 0, 4, 0, 0],
+    ]
+
+    print("=" * 60)
+    print("Testing DLX (Algorithm X) Solver")
+    print("=" * 60)
+
+    solver = DLXSolver()
+    solution = solver.solve(hard_board)
+
+    if solution:
+        print("✓ Solved!")
+        print(f"  Nodes: {solver.stats.nodes}")
+        print(f"  Backtracks: {solver.stats.backtracks}")
+        print(f"  Time: {solver.stats.solve_time:.6f}s")
+        print(f"  Solutions (limit 2): {solver.count_solutions(hard_board, limit=2)}")
+        print("\nSolution:")
+        for row in solution:
+            print(row)
+    else:
+        print("✗ No solution found")
@@ -6,15 +6,24 @@ Sudoku solver using MRV + LCV heuristics.
 - LCV (Least Constraining Value): order candidate values so that the value that
   rules out the fewest choices for neighboring cells is tried first.
 
+MRV 选格用 MRVBuckets 按候选数分桶，赋值 / 回溯时只更新邻居所在的桶；
+tie_break 选择候选数相同的格子之间的平局规则（"index" / "degree" / "wdeg"）。
+
 You can integrate this class into your project as member C's part.
 """
 
 from dataclasses import dataclass
-from copy import deepcopy
-from typing import List, Optional, Tuple, Set
+from functools import partial
+from typing import Iterator, List, Optional, Tuple, Set
 import time
 
-Board = List[List[int]]  # 9x9, 0 means empty
+from src.algorithms.flat_board import copy_board
+from src.algorithms.geometry import board_geometry
+from src.algorithms.mrv_buckets import MRVBuckets
+from src.algorithms.propagation import propagate
+from src.algorithms.search_engine import SOLVED, DepthFirstSearch
+
+Board = List[List[int]]  # NxN（默认 9x9）, 0 means empty
 
 
 @dataclass
@@ -24,17 +33,52 @@ class SolveStats:
     backtracks: int = 0  # 回溯次数
     solve_time: float = 0.0  # 求解时间（秒，包含动画）
     pure_solve_time: float = 0.0  # 纯算法时间（秒，不包含动画）
+    propagated: int = 0  # 约束传播直接推出的格子数
 
 
 class MRVLCVSolver:
-    def __init__(self):
+    def __init__(self, use_propagation: bool = False, box_size: int = 3, tie_break: str = "index"):
         self.stats = SolveStats()
+        # 宫的边长：3 -> 9x9，4 -> 16x16，5 -> 25x25
+        self.box_size = box_size
+        self.size = box_size * box_size
+        geo = board_geometry(box_size)
+        # 候选掩码：第 (v - 1) 位为 1 表示数字 v 可用
+        self._all_digits = geo.all_digits
+        # 掩码中 1 的个数（9x9 / 16x16 直接查表）
+        self._popcount = geo.popcount
+        # 掩码 -> 按升序排列的候选数字
+        self._mask_digits = geo.digits
+        # 格子 (r, c) 所在宫的编号
+        self._box_of = [geo.box_of[r * self.size:(r + 1) * self.size] for r in range(self.size)]
+        # LCV 计数用的邻居表：每个格子的 (行, 列, 宫)。与原先 "行 + 列 + 宫" 三次扫描一致，
+        # 宫内同行 / 同列的邻居出现两次，保证约束计数与排序结果不变
+        n = self.size
+        self._lcv_peers = []
+        for i in range(geo.cells):
+            r, c = divmod(i, n)
+            twice = [p for p in geo.peers[i] if geo.box_of[p] == geo.box_of[i] and (p // n == r or p % n == c)]
+            self._lcv_peers.append(tuple((p // n, p % n, geo.box_of[p]) for p in geo.peers[i] + tuple(twice)))
+        # 每个格子的邻居位集（第 p 位为 1 表示格子 p 是邻居）
+        self._peer_bits = [sum(1 << p for p in geo.peers[i]) for i in range(geo.cells)]
+        # digit_cells[v]：候选中含数字 v 的空格位集，赋值 v 时与邻居位集相与即得候选数要减 1 的格子
+        self._digit_cells = [0] * (n + 1)
+        # 按候选数分桶的空格（MRV 选格），tie_break 为候选数相同时的平局规则
+        self._buckets = MRVBuckets(box_size, tie_break)
+        # 是否在搜索前先做单数/区块排除传播
+        self.use_propagation = use_propagation
         self._solution: Optional[Board] = None
         # 动画回调函数
         self._fill_cb = None
         self._backtrack_cb = None
         # 纯算法时间累计
         self._pure_time_start = 0.0
+        # 行 / 列 / 宫 已用数字掩码，随赋值与回溯增量维护
+        self._row_used = [0] * self.size
+        self._col_used = [0] * self.size
+        self._box_used = [0] * self.size
+        # 外部给出的根节点候选掩码（只在第一次选格子时使用）
+        self._seed_candidates: Optional[List[int]] = None
 
     def set_animation_callbacks(self, fill_cb=None, backtrack_cb=None, ac3_prune_cb=None):
         """设置动画回调函数"""
@@ -43,19 +87,31 @@ class MRVLCVSolver:
 
     # ---------- 外部主接口 ----------
 
-    def solve(self, board: Board) -> Optional[Board]:
+    def solve(self, board: Board, candidates: Optional[List[int]] = None) -> Optional[Board]:
         """
         对给定盘面求解数独。
-        :param board: 9x9 的二维列表，0 表示空格
-        :return: 若有解，返回一个新的已填满的 9x9 棋盘；否则返回 None
+        :param board: NxN（默认 9x9）的二维列表，0 表示空格
+        :param candidates: 可选的候选掩码（长度 N*N，已填格子为 0），例如
+                           batch_candidates.analyze_boards 的结果；给出时第一个
+                           MRV 格子直接从中选取，不再扫描盘面
+        :return: 若有解，返回一个新的已填满的棋盘；否则返回 None
         """
         self.stats = SolveStats()
         self._solution = None
         self._animation_time = 0.0  # 累计动画时间
+        # 约束传播会改变盘面，此时外部给出的候选掩码已经过时
+        self._seed_candidates = None if self.use_propagation else candidates
 
         start_time = time.time()
-        work_board = deepcopy(board)
-        success = self._backtrack(work_board)
+        work_board = copy_board(board)
+        if self.use_propagation and not self._propagate(work_board):
+            success = False
+        elif not self._init_masks(work_board):
+            # 已知数之间互相冲突：直接判为无解，不进入搜索
+            success = False
+        else:
+            self._init_buckets(work_board)
+            success = self._backtrack(work_board)
         self.stats.solve_time = time.time() - start_time
         self.stats.pure_solve_time = self.stats.solve_time - self._animation_time
 
@@ -63,82 +119,185 @@ class MRVLCVSolver:
             return self._solution
         return None
 
+    def _propagate(self, board: Board) -> bool:
+        """搜索前的约束传播；推出的格子按“最终确定”通知动画。发现矛盾返回 False。"""
+        placed = propagate(board)
+        if placed is None:
+            return False
+        self.stats.propagated = len(placed)
+        if self._fill_cb:
+            anim_start = time.time()
+            for row, col, val in placed:
+                self._fill_cb(row, col, val, is_try=False)
+            self._animation_time += (time.time() - anim_start)
+        return True
+
+    def _init_masks(self, board: Board) -> bool:
+        """根据初始盘面建立行/列/宫的已用数字掩码。已知数在同一行 / 列 / 宫中重复时返回 False。"""
+        n = self.size
+        row_used = [0] * n
+        col_used = [0] * n
+        box_used = [0] * n
+        for r in range(n):
+            for c in range(n):
+                v = board[r][c]
+                if v != 0:
+                    bit = 1 << (v - 1)
+                    b = self._box_of[r][c]
+                    if (row_used[r] | col_used[c] | box_used[b]) & bit:
+                        return False
+                    row_used[r] |= bit
+                    col_used[c] |= bit
+                    box_used[b] |= bit
+        self._row_used = row_used
+        self._col_used = col_used
+        self._box_used = box_used
+        return True
+
+    def _init_buckets(self, board: Board) -> None:
+        """把所有空格按当前候选数放进 MRV 分桶，并建立各数字的空格位集。"""
+        n = self.size
+        buckets = self._buckets
+        buckets.reset()
+        digit_cells = [0] * (n + 1)
+        for r in range(n):
+            for c in range(n):
+                if board[r][c] == 0:
+                    mask = self._candidate_mask(r, c)
+                    buckets.add(r * n + c, self._popcount(mask))
+                    for v in self._mask_digits(mask):
+                        digit_cells[v] |= 1 << (r * n + c)
+        self._digit_cells = digit_cells
+
+    def _candidate_mask(self, row: int, col: int) -> int:
+        """空格 (row, col) 的候选掩码：一次 OR 再取反。"""
+        return self._all_digits & ~(self._row_used[row] | self._col_used[col]
+                                    | self._box_used[self._box_of[row][col]])
+
     # ---------- 核心回溯 + MRV + LCV ----------
 
     def _backtrack(self, board: Board) -> bool:
         """
         回溯求解，结合 MRV + LCV。
+        搜索在显式栈上进行（search_engine.DepthFirstSearch），不受递归深度限制。
         """
+        return DepthFirstSearch(partial(self._expand, board)).run()
+
+    def _expand(self, board: Board):
+        """展开一个搜索节点：找到解返回 SOLVED，剪枝返回 None，否则返回各候选分支。"""
         # 选择 MRV 格子：候选数最少的空格
         mrv_info = self._find_mrv_cell(board)
         if mrv_info is None:
             # 没有空格了，说明已经找到解
-            self._solution = deepcopy(board)
+            self._solution = copy_board(board)
             # 不再重新填充所有数字，因为在回溯过程中已经填充了
-            return True
+            return SOLVED
 
         (row, col, candidates) = mrv_info
 
         # 如果某个空格没有候选，提前失败（剪枝）
         if not candidates:
-            return False
+            self._buckets.bump(row * self.size + col)
+            return None
+        return self._branches(board, row, col, candidates)
 
+    def _branches(self, board: Board, row: int, col: int, candidates: Set[int]) -> Iterator[None]:
+        """按 LCV 顺序依次填入各候选，每填入一个 yield 一次，由搜索核心展开下一层。"""
         # 使用 LCV 对候选值排序
         ordered_values = self._order_values_lcv(board, row, col, candidates)
 
+        index = row * self.size + col
+        buckets = self._buckets
+        box = self._box_of[row][col]
+        # 生成器在各分支之间保留局部变量，这些属性只需取一次
+        stats = self.stats
+        board_row = board[row]
+        row_used, col_used, box_used = self._row_used, self._col_used, self._box_used
+        fill_cb, backtrack_cb = self._fill_cb, self._backtrack_cb
+        # 本格移出分桶和各数字的空格位集，回溯完所有候选后再放回
+        digit_cells = self._digit_cells
+        peer_bits = self._peer_bits[index]
+        cell_bit = 1 << index
+        cell_digits = self._mask_digits(self._candidate_mask(row, col))
+        buckets.remove(index)
+        for v in cell_digits:
+            digit_cells[v] &= ~cell_bit
         for val in ordered_values:
-            self.stats.nodes += 1
+            stats.nodes += 1
+
+            board_row[col] = val
+            bit = 1 << (val - 1)
+            # 候选中含 val 的空邻居：候选数减 1
+            affected = digit_cells[val] & peer_bits
+            digit_cells[val] ^= affected
+            buckets.shift(affected, -1)
+            row_used[row] |= bit
+            col_used[col] |= bit
+            box_used[box] |= bit
 
-            board[row][col] = val
-            
             # 动画：尝试填入（蓝色）
-            if self._fill_cb:
+            if fill_cb:
                 anim_start = time.time()
-                self._fill_cb(row, col, val, is_try=True)
+                fill_cb(row, col, val, is_try=True)
                 self._animation_time += (time.time() - anim_start)
-            
-            # 递归求解
-            if self._backtrack(board):
-                return True
+
+            # 进入下一层（找到解时搜索核心直接停止，不再回到这里）
+            yield
 
             # 回溯
-            board[row][col] = 0
-            self.stats.backtracks += 1
-            
+            board_row[col] = 0
+            row_used[row] &= ~bit
+            col_used[col] &= ~bit
+            box_used[box] &= ~bit
+            digit_cells[val] |= affected
+            buckets.shift(affected, 1)
+            stats.backtracks += 1
+
             # 动画：回溯撤销（红色闪烁）
-            if self._backtrack_cb:
+            if backtrack_cb:
                 anim_start = time.time()
-                self._backtrack_cb(row, col)
+                backtrack_cb(row, col)
                 self._animation_time += (time.time() - anim_start)
 
-        return False
+        buckets.add(index, len(cell_digits))
+        for v in cell_digits:
+            digit_cells[v] |= cell_bit
 
     # ---------- MRV：选择候选数最少的格子 ----------
 
     def _find_mrv_cell(self, board: Board) -> Optional[Tuple[int, int, Set[int]]]:
         """
-        在当前盘面中找到一个空格，使其候选数字数量最少（MRV）。
+        在当前盘面中找到一个空格，使其候选数字数量最少（MRV），平局按 tie_break 规则选择。
         若没有空格（已经填满），返回 None。
         若存在空格候选集为空，那么在上层会剪枝。
         """
-        best_row, best_col = -1, -1
-        best_candidates: Optional[Set[int]] = None
+        if self._seed_candidates is not None:
+            seed, self._seed_candidates = self._seed_candidates, None
+            return self._find_mrv_cell_from(board, seed)
 
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] == 0:
-                    cand = self._get_candidates(board, r, c)
-                    if best_candidates is None or len(cand) < len(best_candidates):
-                        best_row, best_col = r, c
-                        best_candidates = cand
-                        # 如果已经发现只有 1 个候选，MRV 最优，直接返回
-                        if len(best_candidates) == 1:
-                            return best_row, best_col, best_candidates
-
-        if best_candidates is None:
+        # 分桶里取候选数最少的空格，不再逐格重算候选掩码
+        index = self._buckets.select()
+        if index < 0:
             # 没有空格了
             return None
-        return best_row, best_col, best_candidates
+        row, col = divmod(index, self.size)
+        return row, col, set(self._mask_digits(self._candidate_mask(row, col)))
+
+    def _find_mrv_cell_from(self, board: Board, masks: List[int]) -> Optional[Tuple[int, int, Set[int]]]:
+        """与 _find_mrv_cell 相同的选择规则，但候选掩码取自外部预先算好的结果。"""
+        n = self.size
+        popcount = self._popcount
+        best_index, best_count = -1, n + 1
+        for i, mask in enumerate(masks):
+            if board[i // n][i % n] == 0:
+                count = popcount(mask)
+                if count < best_count:
+                    best_index, best_count = i, count
+                    if count == 1:
+                        break
+        if best_index < 0:
+            return None
+        return best_index // n, best_index % n, set(self._mask_digits(masks[best_index]))
 
     # ---------- LCV：对候选值进行排序 ----------
 
@@ -153,40 +312,26 @@ class MRVLCVSolver:
         根据 LCV（Least Constraining Value）对候选数值排序：
         尝试那些对相邻格子"约束最小"的值，即在邻居候选中出现次数更少的值。
         """
-
-        def count_constraint(value: int) -> int:
-            """
-            估计把 board[row][col] 设置为 value 之后，会对邻居候选造成多大约束。
-            简单做法：
-              - 统计同一行、同一列、同一宫中，有多少空格把 value 作为候选；
-                这个数字越大，说明这个 value 使用得越"抢占资源"（约束更大）。
-            """
-            count = 0
-
-            # 行和列上的邻居
-            for i in range(9):
-                if board[row][i] == 0 and i != col:
-                    if value in self._get_candidates(board, row, i):
-                        count += 1
-                if board[i][col] == 0 and i != row:
-                    if value in self._get_candidates(board, i, col):
-                        count += 1
-
-            # 宫内邻居
-            br = (row // 3) * 3
-            bc = (col // 3) * 3
-            for r in range(br, br + 3):
-                for c in range(bc, bc + 3):
-                    if (r == row and c == col) or board[r][c] != 0:
-                        continue
-                    if value in self._get_candidates(board, r, c):
-                        count += 1
-
-            return count
+        if len(candidates) == 1:
+            return list(candidates)
+        # 一次扫描邻居：对每个空邻居只算一次候选掩码，按位累计各候选值出现的次数
+        # （原先每个候选值都要重新扫描全部邻居并重算掩码）
+        want = 0
+        for v in candidates:
+            want |= 1 << (v - 1)
+        counts = [0] * (self.size + 1)
+        row_used, col_used, box_used = self._row_used, self._col_used, self._box_used
+        for r, c, box in self._lcv_peers[row * self.size + col]:
+            if board[r][c] == 0:
+                mask = want & ~(row_used[r] | col_used[c] | box_used[box])
+                while mask:
+                    low = mask & -mask
+                    counts[low.bit_length()] += 1
+                    mask ^= low
 
         # 为每个候选值计算"约束度"，然后按从小到大排序
         value_constraint_pairs = [
-            (v, count_constraint(v)) for v in candidates
+            (v, counts[v]) for v in candidates
         ]
         value_constraint_pairs.sort(key=lambda x: x[1])
 
@@ -202,28 +347,7 @@ class MRVLCVSolver:
         if board[row][col] != 0:
             # 如果已经有数字，就没有候选（正常情况下不会调用到这里）
             return set()
-
-        used = set()
-
-        # 行
-        for c in range(9):
-            if board[row][c] != 0:
-                used.add(board[row][c])
-
-        # 列
-        for r in range(9):
-            if board[r][col] != 0:
-                used.add(board[r][col])
-
-        # 宫
-        br = (row // 3) * 3
-        bc = (col // 3) * 3
-        for r in range(br, br + 3):
-            for c in range(bc, bc + 3):
-                if board[r][c] != 0:
-                    used.add(board[r][c])
-
-        return {v for v in range(1, 10) if v not in used}
+        return set(self._mask_digits(self._candidate_mask(row, col)))
 
 
 # ---------------- 示例使用 ----------------
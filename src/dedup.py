@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+命令行批量去重：去掉互为等价变换（行列置换 / 转置 / 换数字）的重复题目。
+
+每道题计算 minlex 规范形式（generator.transforms.canonical_form），
+规范形式相同的题目只保留第一次出现的那道。输入可以是 81 字符文本或二进制题库
+（按文件头自动识别），边读边输出，只在内存中保存已见过的规范形式。
+
+用法（在项目根目录）：
+    python -m src.dedup puzzles.txt > unique.txt
+    python -m src.dedup puzzles.bin --workers 4 --binary -o unique.bin
+    python -m src.dedup puzzles.txt --canonical > canonical.txt
+    python -m src.dedup puzzles.txt --library data/puzzles.sqlite3   # 也去掉题目库中已有的等价题
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.formats.binary_format import BinaryCorpus, BinaryCorpusWriter, is_binary_corpus
+from src.formats.text_format import format_board, iter_puzzles, parse_puzzle
+from src.generator.transforms import canonical_form
+
+Board = List[List[int]]
+
+
+def _canonical_chunk(boards: List[Board]) -> List[str]:
+    return [canonical_form(board) for board in boards]
+
+
+def iter_canonical(boards: Iterable[Board], workers: int = 1,
+                   chunksize: int = 256) -> Iterator[Tuple[Board, str]]:
+    """按输入顺序产出 (盘面, 规范形式)；workers > 1 时分块交给进程池计算。"""
+    if workers <= 1:
+        for board in boards:
+            yield board, canonical_form(board)
+        return
+    it = iter(boards)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # 每次只读入 workers * 4 个分块，不把整个输入载入内存
+            chunks = [chunk for chunk in (list(islice(it, chunksize)) for _ in range(workers * 4)) if chunk]
+            if not chunks:
+                return
+            for chunk, forms in zip(chunks, pool.map(_canonical_chunk, chunks)):
+                yield from zip(chunk, forms)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.dedup",
+        description="按 minlex 规范形式去掉等价的重复题目")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="题目文件（每行一道题，或二进制题库）；省略或为 '-' 时读取标准输入")
+    parser.add_argument("-o", "--output", default="-",
+                        help="输出文件；省略或为 '-' 时写到标准输出")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="计算规范形式的进程数（默认 1）")
+    parser.add_argument("--binary", action="store_true",
+                        help="输出为二进制题库（需要 -o 指定文件）")
+    parser.add_argument("--canonical", action="store_true",
+                        help="输出规范形式而不是原题")
+    parser.add_argument("--library", metavar="DB",
+                        help="题目库文件：库中已有等价题的题目也视为重复")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.binary and args.output == "-":
+        parser.error("--binary 需要用 -o 指定输出文件")
+
+    def report(line_no: int, message: str) -> None:
+        print(f"跳过第 {line_no} 行: {message}", file=sys.stderr)
+
+    seen = set()
+    if args.library is not None:
+        from src.storage.puzzle_library import PuzzleLibrary
+
+        with PuzzleLibrary(args.library) as library:
+            seen.update(row[0] for row in library.conn.execute("SELECT canonical FROM puzzles"))
+
+    if args.input != "-" and is_binary_corpus(args.input):
+        src = BinaryCorpus(args.input)
+        boards = iter(src)
+    else:
+        src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+        boards = (board for _, board in iter_puzzles(src, on_error=report))
+    if args.binary:
+        dst = BinaryCorpusWriter(args.output)
+    else:
+        dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    total = kept = 0
+    try:
+        for board, form in iter_canonical(boards, workers=args.workers):
+            total += 1
+            if form in seen:
+                continue
+            seen.add(form)
+            kept += 1
+            if args.binary:
+                dst.write(parse_puzzle(form) if args.canonical else board)
+            else:
+                dst.write((form if args.canonical else format_board(board)) + "\n")
+    except BrokenPipeError:
+        # 下游（如 head）提前关闭了管道：停止输出，避免退出时再次报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    print(f"共 {total} 道题，保留 {kept} 道，去掉 {total - kept} 道等价重复", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
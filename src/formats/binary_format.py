@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+定长二进制题库格式：每道 9x9 题目 41 字节（每格 4 位），文件用 mmap 读取。
+
+文件布局（小端）：
+    头部 32 字节   魔数 b"SUDOKU41"、版本、头部长度、记录长度、标志位、题目数、索引偏移
+    记录区         题目数 × 41 字节，紧跟在头部之后
+    偏移索引（可选）题目数 × 8 字节，第 i 项为第 i 条记录在文件中的字节偏移
+
+每条记录按行优先存放 81 个格子：第 2k 格在第 k 字节的高 4 位，第 2k+1 格在低 4 位，
+最后一个字节的低 4 位补 0。0 表示空格。
+
+- BinaryCorpus 只 mmap 文件，不解析整个文件：record(i) 返回记录的 memoryview（零拷贝），
+  board(i) / 迭代时才把单条记录解码为 FlatBoard；boards_array() 返回 NumPy 批量解码结果
+- BinaryCorpusWriter 逐条写入，关闭时回填题目数（和索引）
+
+命令行（在项目根目录）：
+    python -m src.formats.binary_format convert puzzles.txt puzzles.bin [--index]
+    python -m src.formats.binary_format info puzzles.bin
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.algorithms.flat_board import FlatBoard
+from src.formats.text_format import format_board, iter_puzzles
+
+Board = List[List[int]]  # 9x9, 0 表示空格
+
+MAGIC = b"SUDOKU41"
+VERSION = 1
+CELLS = 81
+RECORD_SIZE = 41
+FLAG_INDEX = 1  # 文件带偏移索引
+
+# 魔数, 版本, 头部长度, 记录长度, 标志位, 题目数, 索引偏移（无索引时为 0）
+_HEADER = struct.Struct("<8sHHHHQQ")
+HEADER_SIZE = _HEADER.size
+
+# 解码用的查表：字节 -> 高 4 位 / 低 4 位（bytes.translate 在 C 层完成）
+_HIGH = bytes(b >> 4 for b in range(256))
+_LOW = bytes(b & 0x0F for b in range(256))
+# 编码用：数字 -> 左移 4 位
+_SHIFT = bytes((b << 4) & 0xFF for b in range(256))
+
+
+def pack_board(board: Sequence[Sequence[int]]) -> bytes:
+    """把 9x9 盘面编码为 41 字节。"""
+    if len(board) != 9:
+        raise ValueError("二进制格式只支持 9x9 盘面")
+    values = bytearray(v for row in board for v in row)
+    if len(values) != CELLS:
+        raise ValueError("二进制格式只支持 9x9 盘面")
+    if max(values) > 9:
+        raise ValueError(f"非法数字: {max(values)}")
+    values.append(0)
+    high = int.from_bytes(values[0::2].translate(_SHIFT), "big")
+    low = int.from_bytes(values[1::2], "big")
+    return (high | low).to_bytes(RECORD_SIZE, "big")
+
+
+def unpack_record(record: Union[bytes, memoryview]) -> FlatBoard:
+    """把 41 字节的记录解码为 FlatBoard。"""
+    record = bytes(record)
+    values = bytearray(CELLS + 1)
+    values[0::2] = record.translate(_HIGH)
+    values[1::2] = record.translate(_LOW)
+    del values[CELLS:]
+    return FlatBoard(values, 9)
+
+
+class BinaryCorpusWriter:
+    """逐条写入二进制题库；用作上下文管理器，退出时回填头部。"""
+
+    def __init__(self, path: str, index: bool = False):
+        """
+        :param path: 输出文件
+        :param index: 是否在记录区之后写偏移索引
+        """
+        self.path = path
+        self.index = index
+        self.count = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, HEADER_SIZE, RECORD_SIZE, 0, 0, 0))
+
+    def write(self, board: Sequence[Sequence[int]]) -> None:
+        self._file.write(pack_board(board))
+        self.count += 1
+
+    def write_many(self, boards: Iterable[Sequence[Sequence[int]]]) -> int:
+        """写入多道题，返回写入的题目数。"""
+        before = self.count
+        for board in boards:
+            self.write(board)
+        return self.count - before
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        flags = index_offset = 0
+        if self.index:
+            flags |= FLAG_INDEX
+            index_offset = HEADER_SIZE + self.count * RECORD_SIZE
+            self._file.write(b"".join(struct.pack("<Q", HEADER_SIZE + i * RECORD_SIZE)
+                                      for i in range(self.count)))
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, HEADER_SIZE, RECORD_SIZE, flags,
+                                      self.count, index_offset))
+        self._file.close()
+
+    def __enter__(self) -> "BinaryCorpusWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class BinaryCorpus:
+    """mmap 方式只读打开的二进制题库，按序号随机访问，可迭代（产出 FlatBoard）。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, header_size, record_size, flags, count, index_offset = \
+                _HEADER.unpack(f.read(HEADER_SIZE).ljust(HEADER_SIZE, b"\0"))
+            if magic != MAGIC:
+                raise ValueError(f"不是二进制题库文件: {path}")
+            if version != VERSION or record_size != RECORD_SIZE:
+                raise ValueError(f"不支持的版本 {version} / 记录长度 {record_size}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._header_size = header_size
+        self._index_offset = index_offset if flags & FLAG_INDEX else 0
+        self.count = count
+        if len(self._mm) < header_size + count * RECORD_SIZE:
+            raise ValueError(f"文件被截断: {path}")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def offset(self, i: int) -> int:
+        """第 i 条记录的字节偏移；有索引时按索引定位。"""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        if self._index_offset:
+            return struct.unpack_from("<Q", self._mm, self._index_offset + 8 * i)[0]
+        return self._header_size + i * RECORD_SIZE
+
+    def record(self, i: int) -> memoryview:
+        """第 i 条记录的原始 41 字节（映射内存的视图，不复制）。"""
+        start = self.offset(i)
+        return memoryview(self._mm)[start:start + RECORD_SIZE]
+
+    def board(self, i: int) -> FlatBoard:
+        return unpack_record(self.record(i))
+
+    __getitem__ = board
+
+    def __iter__(self) -> Iterator[FlatBoard]:
+        # 记录连续存放，顺序读取时不查索引
+        mm, start = self._mm, self._header_size
+        for k in range(self.count):
+            offset = start + k * RECORD_SIZE
+            yield unpack_record(mm[offset:offset + RECORD_SIZE])
+
+    def records_array(self, start: int = 0, stop: Optional[int] = None):
+        """记录区 [start, stop) 的 (N, 41) uint8 数组，直接引用映射内存（需要 numpy）。"""
+        import numpy as np
+
+        start, stop, _ = slice(start, stop).indices(self.count)
+        count = max(stop - start, 0)
+        return np.frombuffer(self._mm, dtype=np.uint8, count=count * RECORD_SIZE,
+                             offset=self._header_size + start * RECORD_SIZE).reshape(count, RECORD_SIZE)
+
+    def boards_array(self, start: int = 0, stop: Optional[int] = None):
+        """把 [start, stop) 的题目一次性解码为 (N, 9, 9) uint8 数组（需要 numpy）。"""
+        import numpy as np
+
+        records = self.records_array(start, stop)
+        values = np.empty((len(records), RECORD_SIZE * 2), dtype=np.uint8)
+        values[:, 0::2] = records >> 4
+        values[:, 1::2] = records & 0x0F
+        return values[:, :CELLS].reshape(-1, 9, 9)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "BinaryCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def is_binary_corpus(path: str) -> bool:
+    """文件是否以二进制题库的魔数开头。"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_corpus(path: str, boards: Iterable[Sequence[Sequence[int]]], index: bool = False) -> int:
+    """把一组盘面写成二进制题库，返回题目数。"""
+    with BinaryCorpusWriter(path, index=index) as writer:
+        return writer.write_many(boards)
+
+
+def text_to_binary(src: str, dst: str, index: bool = False) -> Tuple[int, int]:
+    """把 81 字符文本题库转换为二进制，返回 (写入题目数, 跳过的行数)。"""
+    skipped = []
+
+    def report(line_no: int, message: str) -> None:
+        skipped.append(line_no)
+        print(f"跳过第 {line_no} 行: {message}", file=sys.stderr)
+
+    with open(src, "r", encoding="utf-8") as f:
+        written = write_corpus(dst, (board for _, board in iter_puzzles(f, on_error=report)), index)
+    return written, len(skipped)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.formats.binary_format",
+                                     description="41 字节定长二进制题库")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="81 字符文本 -> 二进制")
+    convert.add_argument("input")
+    convert.add_argument("output")
+    convert.add_argument("--index", action="store_true", help="写入偏移索引")
+    info = commands.add_parser("info", help="显示题目数并打印前几道题")
+    info.add_argument("input")
+    info.add_argument("--head", type=int, default=3, help="打印的题目数")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        written, skipped = text_to_binary(args.input, args.output, args.index)
+        print(f"写入 {written} 道题，跳过 {skipped} 行", file=sys.stderr)
+        return 0
+    with BinaryCorpus(args.input) as corpus:
+        print(f"{args.input}: {len(corpus)} 道题，索引: {'有' if corpus._index_offset else '无'}")
+        for i in range(min(args.head, len(corpus))):
+            print(format_board(corpus[i]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
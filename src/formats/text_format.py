@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+标准单行文本格式：每行 81 个字符，按行优先顺序排列，
+'1'-'9' 为已知数，'.' 或 '0' 为空格。
+"""
+
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+Board = List[List[int]]  # 9x9, 0 表示空格
+
+PUZZLE_LENGTH = 81
+_EMPTY_CHARS = ".0"
+
+
+def parse_puzzle(line: str) -> Board:
+    """把一行 81 字符的题目解析为 9x9 棋盘；格式不对时抛出 ValueError。"""
+    text = line.strip()
+    if len(text) != PUZZLE_LENGTH:
+        raise ValueError(f"题目长度应为 {PUZZLE_LENGTH}，实际为 {len(text)}")
+    values = []
+    for ch in text:
+        if ch in _EMPTY_CHARS:
+            values.append(0)
+        elif "1" <= ch <= "9":
+            values.append(ord(ch) - 48)
+        else:
+            raise ValueError(f"非法字符: {ch!r}")
+    return [values[r * 9:(r + 1) * 9] for r in range(9)]
+
+
+def format_board(board: Board, empty: str = ".") -> str:
+    """把 9x9 棋盘格式化为一行 81 字符。"""
+    return "".join(str(v) if v else empty for row in board for v in row)
+
+
+def iter_puzzles(lines: Iterable[str],
+                 on_error: Optional[Callable[[int, str], None]] = None) -> Iterator[Tuple[int, Board]]:
+    """
+    逐行读取题目，产出 (行号, 棋盘)，行号从 1 开始。
+    空行和以 '#' 开头的注释行会被跳过。
+    格式错误的行：未给出 on_error 时抛出附带行号的 ValueError；
+    否则调用 on_error(行号, 错误信息) 并跳过该行。
+    """
+    for line_no, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            board = parse_puzzle(text)
+        except ValueError as e:
+            if on_error is None:
+                raise ValueError(f"第 {line_no} 行: {e}") from None
+            on_error(line_no, str(e))
+            continue
+        yield line_no, board
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+按难度预先生成的题目池（保存在磁盘上），让界面点击 "生成数独" 时立即拿到题目。
+
+目录结构（默认 <项目根目录>/data/puzzle_pool）：
+    Easy.txt / Medium.txt / Hard.txt   题目池，每行 "81 字符题目<TAB>评级<TAB>节点数<TAB>回溯数<TAB>提示数"
+    incoming/                          补充进程写入的新题目（每道题一个文件）
+    Hard.lock                          某难度正在补充时由补充进程持有
+    Hard.txt.lock                      读写 Hard.txt / incoming/ 时短暂持有的文件锁
+
+- take(difficulty) 从池中取出一道题；取题前先把 incoming/ 中的新题合并进池文件，
+  池文件只由取题方改写（先写临时文件再 os.replace，保证原子性）
+- "读池文件 -> 合并 incoming/ -> 取出一道 -> 写回" 与放入新题都在 Hard.txt.lock 的排他锁内完成，
+  多个界面进程与补充进程同时取放时不会发出同一道题，也不会丢掉刚合并的新题
+- 池中剩余题目低于 low_watermark 时，在后台启动一个补充进程，
+  把池补到 target_size；补充进程只往 incoming/ 写文件，不碰池文件
+
+补充进程也可以手动运行（在项目根目录）：
+    python -m src.generator.puzzle_pool refill --difficulty Hard --count 20
+    python -m src.generator.puzzle_pool status
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from src.formats.text_format import format_board, parse_puzzle
+
+Board = List[List[int]]
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_POOL_DIR = os.path.join(PROJECT_ROOT, "data", "puzzle_pool")
+# 补充进程异常退出后残留的锁文件，超过这个时间（秒）视为失效
+STALE_LOCK_SECONDS = 600
+
+
+def _format_entry(puzzle: Board, info: Dict) -> str:
+    stats = info["stats"]
+    return (f"{format_board(puzzle)}\t{info['level']}\t{stats['nodes']}\t"
+            f"{stats['backtracks']}\t{info['clues']}\n")
+
+
+def _parse_entry(line: str) -> Tuple[Board, Dict]:
+    text, level, nodes, backtracks, clues = line.rstrip("\n").split("\t")
+    info = {"level": level, "stats": {"nodes": int(nodes), "backtracks": int(backtracks)},
+            "clues": int(clues)}
+    return parse_puzzle(text), info
+
+
+def _atomic_write(path: str, lines: List[str]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """进程间排他锁（POSIX 用 fcntl.flock，Windows 用 msvcrt.locking），退出 with 块时释放。"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class PuzzlePool:
+    def __init__(self, directory: str = DEFAULT_POOL_DIR, low_watermark: int = 5, target_size: int = 20,
+                 library: Optional[str] = None):
+        """
+        :param directory: 题目池目录
+        :param low_watermark: 剩余题目少于该值时启动后台补充
+        :param target_size: 每次补充到的题目数
+        :param library: 题目库（SQLite）文件路径；给出时补充进程生成的题目同时存入题目库
+        """
+        self.directory = directory
+        self.library = library
+        self.incoming_dir = os.path.join(directory, "incoming")
+        self.low_watermark = low_watermark
+        self.target_size = target_size
+        self._refills: Dict[str, subprocess.Popen] = {}  # 本进程启动的补充进程
+        os.makedirs(self.incoming_dir, exist_ok=True)
+
+    def _pool_path(self, difficulty: str) -> str:
+        return os.path.join(self.directory, f"{difficulty}.txt")
+
+    def _lock_path(self, difficulty: str) -> str:
+        return os.path.join(self.directory, f"{difficulty}.lock")
+
+    def _pool_lock(self, difficulty: str):
+        """池文件与 incoming/ 的读写锁（只在取放的几毫秒内持有，与补充进程的 .lock 无关）。"""
+        return _file_lock(self._pool_path(difficulty) + ".lock")
+
+    @staticmethod
+    def _check_difficulty(difficulty: str) -> None:
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"难度必须是: {list(DIFFICULTIES)}")
+
+    # ---------- 池文件读写（只由取题方在 _pool_lock 内调用） ----------
+
+    def _read(self, difficulty: str) -> List[str]:
+        try:
+            with open(self._pool_path(difficulty), "r", encoding="utf-8") as f:
+                return [line for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _merge_incoming(self, difficulty: str, lines: List[str]) -> List[str]:
+        """把补充进程写入 incoming/ 的题目并入 lines，返回合并后的列表（尚未写回）。"""
+        merged = []
+        prefix = f"{difficulty}-"
+        for name in sorted(os.listdir(self.incoming_dir)):
+            if not (name.startswith(prefix) and name.endswith(".txt")):
+                continue
+            path = os.path.join(self.incoming_dir, name)
+            with open(path, "r", encoding="utf-8") as f:
+                lines.extend(line for line in f if line.strip())
+            merged.append(path)
+        if merged:
+            _atomic_write(self._pool_path(difficulty), lines)
+            for path in merged:
+                os.remove(path)
+        return lines
+
+    def size(self, difficulty: str) -> int:
+        """池中（含尚未合并的）题目数。"""
+        self._check_difficulty(difficulty)
+        with self._pool_lock(difficulty):
+            return len(self._merge_incoming(difficulty, self._read(difficulty)))
+
+    def take(self, difficulty: str) -> Optional[Tuple[Board, Dict]]:
+        """
+        取出一道题，返回 (puzzle, info)，info 与 generate_puzzle_with_difficulty 相同；
+        池为空时返回 None。剩余过少时会在后台启动补充进程。
+        """
+        self._check_difficulty(difficulty)
+        with self._pool_lock(difficulty):
+            lines = self._merge_incoming(difficulty, self._read(difficulty))
+            entry = None
+            if lines:
+                entry = _parse_entry(lines[0])
+                _atomic_write(self._pool_path(difficulty), lines[1:])
+        if len(lines) - 1 < self.low_watermark:
+            self.refill_async(difficulty, self.target_size - max(len(lines) - 1, 0))
+        return entry
+
+    def put(self, difficulty: str, puzzle: Board, info: Dict) -> None:
+        """往 incoming/ 放入一道题（补充进程或其它生成方使用）。"""
+        self._check_difficulty(difficulty)
+        name = f"{difficulty}-{os.getpid()}-{time.time_ns()}.txt"
+        with self._pool_lock(difficulty):
+            _atomic_write(os.path.join(self.incoming_dir, name), [_format_entry(puzzle, info)])
+
+    # ---------- 后台补充 ----------
+
+    def refill_async(self, difficulty: str, count: int) -> bool:
+        """启动后台补充进程；已有补充进程在运行时不重复启动。返回是否启动了新进程。"""
+        running = self._refills.get(difficulty)
+        if running is not None and running.poll() is None:
+            return False
+        if count <= 0 or self._locked(self._lock_path(difficulty)):
+            return False
+        self._refills[difficulty] = subprocess.Popen(
+            [sys.executable, "-m", "src.generator.puzzle_pool", "refill",
+             "--difficulty", difficulty, "--count", str(count), "--dir", self.directory,
+             *(["--library", self.library] if self.library else [])],
+            cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+
+    def warm_up(self) -> None:
+        """为所有低于水位的难度启动后台补充（程序启动时调用）。"""
+        for difficulty in DIFFICULTIES:
+            remaining = self.size(difficulty)
+            if remaining < self.low_watermark:
+                self.refill_async(difficulty, self.target_size - remaining)
+
+    @staticmethod
+    def _locked(lock: str) -> bool:
+        """锁文件存在且未失效。"""
+        try:
+            age = time.time() - os.path.getmtime(lock)
+        except FileNotFoundError:
+            return False
+        return age < STALE_LOCK_SECONDS
+
+    def _acquire(self, lock: str) -> bool:
+        """用 O_EXCL 创建锁文件；已失效的旧锁会被清理后重试一次。"""
+        for _ in range(2):
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._locked(lock):
+                    return False
+                try:
+                    os.remove(lock)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def refill(self, difficulty: str, count: int, seed: Optional[int] = None) -> int:
+        """
+        在当前进程内生成 count 道题放入 incoming/（补充进程的主体）。
+        同一难度同时只允许一个补充方；返回实际生成的题目数。
+        """
+        from src.generator.sudoku_generator import SudokuGenerator
+
+        self._check_difficulty(difficulty)
+        lock = self._lock_path(difficulty)
+        if not self._acquire(lock):
+            return 0
+        library = None
+        try:
+            if self.library:
+                from src.storage.puzzle_library import PuzzleLibrary
+
+                library = PuzzleLibrary(self.library)
+            generator = SudokuGenerator(seed=seed, verbose=False)
+            for _ in range(count):
+                puzzle, info = generator.generate_puzzle_with_difficulty(difficulty, max_retries=20)
+                self.put(difficulty, puzzle, info)
+                if library is not None:
+                    library.add(puzzle, info)
+                os.utime(lock)  # 刷新锁的时间，表明补充进程仍在工作
+            return count
+        finally:
+            if library is not None:
+                library.close()
+            os.remove(lock)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.generator.puzzle_pool",
+                                     description="管理按难度预生成的题目池")
+    parser.add_argument("command", choices=["refill", "status"])
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, help="难度（refill 时必填）")
+    parser.add_argument("--count", type=int, default=20, help="补充的题目数（默认 20）")
+    parser.add_argument("--dir", default=DEFAULT_POOL_DIR, help="题目池目录")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--library", default=None, help="同时存入的题目库（SQLite）文件")
+    args = parser.parse_args(argv)
+
+    pool = PuzzlePool(args.dir, library=args.library)
+    if args.command == "status":
+        for difficulty in DIFFICULTIES:
+            print(f"{difficulty}: {pool.size(difficulty)}")
+        return 0
+    if args.difficulty is None:
+        parser.error("refill 需要 --difficulty")
+    made = pool.refill(args.difficulty, args.count, seed=args.seed)
+    print(f"{args.difficulty}: 新增 {made} 道题", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+界面取题用的题目池与题目库（进程内各一个，第一次用到时才创建）。
+
+只导入界面模块（如 test_premium.py）时不会创建数据文件，也不会启动补充进程；
+创建失败时打印警告并返回 None，之后不再重试，界面退回现场生成。
+
+    pool, library = get_puzzle_pool(), get_puzzle_library()
+    pooled = pool.take("Hard") if pool else None
+"""
+
+import sqlite3
+from functools import lru_cache
+from typing import Optional
+
+from src.generator.puzzle_pool import PuzzlePool
+from src.storage.puzzle_library import PuzzleLibrary
+
+
+@lru_cache(maxsize=None)
+def get_puzzle_library() -> Optional[PuzzleLibrary]:
+    """题目库（SQLite）：保存所有生成过的已评级题目，池为空时从中随机取题。"""
+    try:
+        return PuzzleLibrary()
+    except (OSError, sqlite3.Error) as e:
+        print(f"✗ 警告：题目库不可用 - {e}")
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_puzzle_pool() -> Optional[PuzzlePool]:
+    """按难度预生成的题目池，补充进程生成的题目同时存入题目库。"""
+    library = get_puzzle_library()
+    try:
+        return PuzzlePool(library=library.path if library else None)
+    except OSError as e:
+        print(f"✗ 警告：题目池不可用 - {e}")
+        return None
+
+
+def warm_up_pool() -> None:
+    """程序启动时调用：为低于水位的难度在后台启动补充进程。"""
+    pool = get_puzzle_pool()
+    if pool is None:
+        return
+    try:
+        pool.warm_up()
+    except OSError as e:
+        print(f"✗ 警告：题目池不可用 - {e}")
+
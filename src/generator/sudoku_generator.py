@@ -4,18 +4,47 @@ sudoku_generator.py (改进版)
 新增:根据目标难度生成题目
 """
 
+import os
 import random
-from copy import deepcopy
-from typing import List, Tuple, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import isqrt
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.algorithms.flat_board import copy_board
+from src.algorithms.propagation import propagate
+from src.algorithms.search_engine import SOLVED, DepthFirstSearch
+from src.algorithms.solution_counter import SolutionCounter
 from src.algorithms.solver_mrv_lcv import MRVLCVSolver
+from src.generator.transforms import random_transform
 
 Board = List[List[int]]
 
 
 class SudokuGenerator:
-    def __init__(self, seed: Optional[int] = None):
-        if seed is not None:
-            random.seed(seed)
+    def __init__(self, seed: Optional[int] = None, use_propagation: bool = False, box_size: int = 3,
+                 incremental: bool = True, fast_full: bool = False, reseed_every: int = 1000,
+                 verbose: bool = True):
+        # 每个生成器独享一个随机数发生器，互不影响，可在多进程中按种子复现
+        self.rng = random.Random(seed)
+        # 是否打印生成过程
+        self.verbose = verbose
+
+        # 宫的边长：3 -> 9x9，4 -> 16x16，5 -> 25x25
+        self.box_size = box_size
+        self.size = box_size * box_size
+
+        # 唯一性判断前是否先做单数/区块排除传播（挖洞的增量判断同样适用，不影响难度评估）
+        self.use_propagation = use_propagation
+        # 唯一性判断用的位掩码 + MRV 计数器
+        self._counter = SolutionCounter(box_size)
+        # 挖洞时是否用增量唯一性判断（利用已知终盘，只找与终盘不同的解）
+        self.incremental = incremental
+        # 快速终盘：对一张基准终盘做随机等价变换（换数字 / 行列置换 / 转置），
+        # 每生成 reseed_every 张终盘后用回溯重新生成基准终盘，避免总在同一个等价类里
+        self.fast_full = fast_full
+        self.reseed_every = reseed_every
+        self._base: Optional[Board] = None
+        self._base_uses = 0
 
         # 难度阈值配置(可根据实际调整)
         self.difficulty_ranges = {
@@ -26,58 +55,85 @@ class SudokuGenerator:
 
     @staticmethod
     def print_board(board: Board):
-        for r in range(9):
+        n = len(board)
+        b = isqrt(n)
+        width = len(str(n))
+        for r in range(n):
             row_str = ""
-            for c in range(9):
+            for c in range(n):
                 v = board[r][c]
-                row_str += (str(v) if v != 0 else ".") + " "
-                if c % 3 == 2 and c < 8:
+                row_str += (str(v) if v != 0 else ".").rjust(width) + " "
+                if c % b == b - 1 and c < n - 1:
                     row_str += "| "
             print(row_str)
-            if r % 3 == 2 and r < 8:
-                print("-" * 21)
+            if r % b == b - 1 and r < n - 1:
+                print("-" * ((width + 1) * n + 2 * (b - 1) - 1))
         print()
 
     # 生成完整终盘
     def generate_full_solution(self) -> Board:
-        board = [[0 for _ in range(9)] for _ in range(9)]
+        if self.fast_full:
+            return self._transformed_base()
+        board = [[0 for _ in range(self.size)] for _ in range(self.size)]
         self._fill_board_randomly(board)
         return board
 
+    def reseed_base(self) -> None:
+        """用随机回溯重新生成快速模式使用的基准终盘。"""
+        board = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        self._fill_board_randomly(board)
+        self._base = board
+        self._base_uses = 0
+
+    def _transformed_base(self) -> Board:
+        """快速模式：基准终盘的一个随机等价盘面。"""
+        if self._base is None or (self.reseed_every and self._base_uses >= self.reseed_every):
+            self.reseed_base()
+        self._base_uses += 1
+        return random_transform(self.box_size, self.rng).apply(self._base)
+
     def _fill_board_randomly(self, board: Board) -> bool:
+        """随机顺序回溯填满 board（显式栈搜索，见 search_engine.DepthFirstSearch）。"""
+        return DepthFirstSearch(partial(self._expand_fill, board)).run()
+
+    def _expand_fill(self, board: Board):
         empty = self._find_empty(board)
         if not empty:
-            return True
+            return SOLVED
         row, col = empty
 
-        nums = list(range(1, 10))
-        random.shuffle(nums)
+        nums = list(range(1, len(board) + 1))
+        self.rng.shuffle(nums)
+        return self._fill_branches(board, row, col, nums)
 
+    def _fill_branches(self, board: Board, row: int, col: int, nums: List[int]) -> Iterator[None]:
+        board_row = board[row]
         for val in nums:
             if self._is_safe(board, row, col, val):
-                board[row][col] = val
-                if self._fill_board_randomly(board):
-                    return True
-                board[row][col] = 0
-        return False
+                board_row[col] = val
+                yield
+                board_row[col] = 0
 
     @staticmethod
     def _find_empty(board: Board) -> Optional[Tuple[int, int]]:
-        for r in range(9):
-            for c in range(9):
+        n = len(board)
+        for r in range(n):
+            for c in range(n):
                 if board[r][c] == 0:
                     return r, c
         return None
 
     @staticmethod
     def _is_safe(board: Board, row: int, col: int, val: int) -> bool:
-        for i in range(9):
+        n = len(board)
+        for i in range(n):
             if board[row][i] == val or board[i][col] == val:
                 return False
 
-        br, bc = (row // 3) * 3, (col // 3) * 3
-        for r in range(br, br + 3):
-            for c in range(bc, bc + 3):
+        b = isqrt(n)
+        br, bc = (row // b) * b, (col // b) * b
+        for r in range(br, br + b):
+            for c in range(bc, bc + b):
                 if board[r][c] == val:
                     return False
         return True
@@ -90,12 +146,13 @@ class SudokuGenerator:
             max_attempts: int = 1000
     ) -> Board:
         full = self.generate_full_solution()
-        puzzle = deepcopy(full)
+        puzzle = copy_board(full)
 
-        cells = [(r, c) for r in range(9) for c in range(9)]
-        random.shuffle(cells)
+        n = self.size
+        cells = [(r, c) for r in range(n) for c in range(n)]
+        self.rng.shuffle(cells)
 
-        clues = 81
+        clues = n * n
         attempts = 0
 
         for (row, col) in cells:
@@ -105,7 +162,7 @@ class SudokuGenerator:
                 continue
 
             backup_val = puzzle[row][col]
-            sym_row, sym_col = 8 - row, 8 - col
+            sym_row, sym_col = n - 1 - row, n - 1 - col
             backup_sym = puzzle[sym_row][sym_col] if symmetric else backup_val
 
             puzzle[row][col] = 0
@@ -114,8 +171,9 @@ class SudokuGenerator:
 
             removed = 1 if (row, col) == (sym_row, sym_col) else 2
             new_clues = clues - removed
+            holes = [(row, col), (sym_row, sym_col)] if symmetric and removed == 2 else [(row, col)]
 
-            if new_clues >= target_clues and self.has_unique_solution(puzzle):
+            if new_clues >= target_clues and self._still_unique(puzzle, full, holes):
                 clues = new_clues
             else:
                 puzzle[row][col] = backup_val
@@ -158,13 +216,14 @@ class SudokuGenerator:
         best_diff = float('inf')
 
         for attempt in range(max_retries):
-            # 根据难度动态调整提示数
+            # 根据难度动态调整提示数（按 9x9 设定，其它尺寸按格子数等比例缩放）
             if target_difficulty == "Easy":
-                target_clues = random.randint(40, 50)
+                target_clues = self.rng.randint(40, 50)
             elif target_difficulty == "Medium":
-                target_clues = random.randint(30, 40)
+                target_clues = self.rng.randint(30, 40)
             else:  # Hard
-                target_clues = random.randint(22, 32)
+                target_clues = self.rng.randint(22, 32)
+            target_clues = target_clues * self.size * self.size // 81
 
             # 生成题目
             puzzle = self.generate_puzzle(
@@ -180,7 +239,8 @@ class SudokuGenerator:
             # 计算与目标难度的偏差
             if min_nodes <= nodes < max_nodes:
                 # 完全符合目标难度
-                print(f"✓ 第{attempt + 1}次尝试成功! 节点数:{nodes}, 难度:{level}")
+                if self.verbose:
+                    print(f"✓ 第{attempt + 1}次尝试成功! 节点数:{nodes}, 难度:{level}")
                 return puzzle, {"level": level, "stats": stats, "clues": self._count_clues(puzzle)}
 
             # 记录最接近目标的题目
@@ -193,21 +253,43 @@ class SudokuGenerator:
                 best_diff = diff
                 best_puzzle = puzzle
                 best_stats = {"level": level, "stats": stats, "clues": self._count_clues(puzzle)}
-                print(f"  第{attempt + 1}次: 节点数={nodes}, 难度={level} (最接近)")
+                if self.verbose:
+                    print(f"  第{attempt + 1}次: 节点数={nodes}, 难度={level} (最接近)")
 
-        print(f"⚠ 经过{max_retries}次尝试,返回最接近的题目")
+        if self.verbose:
+            print(f"⚠ 经过{max_retries}次尝试,返回最接近的题目")
         return best_puzzle, best_stats
 
     @staticmethod
     def _count_clues(board: Board) -> int:
         """统计提示数"""
-        return sum(1 for r in range(9) for c in range(9) if board[r][c] != 0)
+        return sum(1 for row in board for v in row if v != 0)
 
     # 唯一性判断
     def has_unique_solution(self, board: Board, solution_limit: int = 2) -> bool:
-        count = self._count_solutions(deepcopy(board), limit=solution_limit)
+        puzzle = board
+        if self.use_propagation:
+            puzzle = copy_board(board)
+            if propagate(puzzle) is None:
+                return False
+        count = self._counter.count(puzzle, limit=solution_limit)
         return count == 1
 
+    def _still_unique(self, puzzle: Board, full: Board, holes: List[Tuple[int, int]]) -> bool:
+        """挖掉 holes 之后题目是否仍然唯一（挖之前已知唯一，且 full 是它的解）。"""
+        if not self.incremental:
+            return self.has_unique_solution(puzzle)
+        if self.use_propagation:
+            # 传播推出的数字对所有解都成立，必然与 full 相同；被推出的洞不可能有别的取值
+            puzzle = copy_board(puzzle)
+            if propagate(puzzle) is None:
+                return False
+            holes = [(r, c) for (r, c) in holes if puzzle[r][c] == 0]
+            if not holes:
+                return True
+        return not self._counter.has_other_solution(puzzle, full, holes)
+
+    # 原始的逐格 DFS 计数（保留作对照，见 benchmarks/bench_generator.py）
     def _count_solutions(self, board: Board, limit: int = 2) -> int:
         self._solution_count = 0
         self._solution_limit = limit
@@ -215,27 +297,34 @@ class SudokuGenerator:
         return self._solution_count
 
     def _dfs_count(self, board: Board):
+        DepthFirstSearch(partial(self._expand_count, board)).run()
+
+    def _expand_count(self, board: Board):
         if self._solution_count >= self._solution_limit:
-            return
+            return None
 
         empty = self._find_empty(board)
         if not empty:
             self._solution_count += 1
-            return
+            return None
 
         row, col = empty
-        for val in range(1, 10):
+        return self._count_branches(board, row, col)
+
+    def _count_branches(self, board: Board, row: int, col: int) -> Iterator[None]:
+        board_row = board[row]
+        for val in range(1, len(board) + 1):
             if self._is_safe(board, row, col, val):
-                board[row][col] = val
-                self._dfs_count(board)
-                board[row][col] = 0
+                board_row[col] = val
+                yield
+                board_row[col] = 0
                 if self._solution_count >= self._solution_limit:
                     return
 
     # 难度评估
     def evaluate_difficulty(self, board: Board) -> Tuple[str, Dict]:
-        puzzle = deepcopy(board)
-        solver = MRVLCVSolver()
+        puzzle = copy_board(board)
+        solver = MRVLCVSolver(box_size=self.box_size)
         solution = solver.solve(puzzle)
 
         if solution is None:
@@ -252,6 +341,110 @@ class SudokuGenerator:
         return "Hard", {"nodes": nodes, "backtracks": backtracks}
 
 
+    # 等价扩展：由一道已评级的题目批量产生同结构的新题
+    def iter_isomorphs(
+            self,
+            puzzle: Board,
+            target_difficulty: Optional[str] = None,
+            count: Optional[int] = None,
+            max_failures: int = 1000
+    ) -> Iterator[Tuple[Board, Dict]]:
+        """
+        不断产出 puzzle 的随机等价题目（换数字 / 行列置换 / 转置），互不重复。
+
+        等价题目的解数与提示数不变，但节点数评级依赖格子顺序，
+        所以每道都会用 evaluate_difficulty 重新评级；给出 target_difficulty 时
+        只产出评级仍落在该难度节点范围内的题目。
+
+        参数:
+            puzzle: 种子题目
+            target_difficulty: "Easy" / "Medium" / "Hard"；None 表示不筛选
+            count: 最多产出的题目数；None 表示无限
+            max_failures: 连续多少次得到重复或不在范围内的题目后停止
+
+        产出:
+            (puzzle, info)，info 与 generate_puzzle_with_difficulty 相同，另含 "transform"
+        """
+        if target_difficulty is not None and target_difficulty not in self.difficulty_ranges:
+            raise ValueError(f"难度必须是: {list(self.difficulty_ranges.keys())}")
+
+        seen = {tuple(v for row in puzzle for v in row)}
+        clues = self._count_clues(puzzle)
+        produced = failures = 0
+        while (count is None or produced < count) and failures < max_failures:
+            transform = random_transform(self.box_size, self.rng)
+            candidate = transform.apply(puzzle)
+            key = tuple(v for row in candidate for v in row)
+            if key in seen:
+                failures += 1
+                continue
+            seen.add(key)
+
+            level, stats = self.evaluate_difficulty(candidate)
+            if target_difficulty is not None:
+                min_nodes, max_nodes = self.difficulty_ranges[target_difficulty]
+                if not min_nodes <= stats["nodes"] < max_nodes:
+                    failures += 1
+                    continue
+
+            failures = 0
+            produced += 1
+            yield candidate, {"level": level, "stats": stats, "clues": clues, "transform": transform}
+
+
+def _generate_one(task: Tuple[int, str, int, Dict]) -> Tuple[Board, Dict]:
+    """工作进程：用派生种子新建一个生成器，生成一道指定难度的题目。"""
+    seed, difficulty, max_retries, options = task
+    generator = SudokuGenerator(seed=seed, verbose=False, **options)
+    return generator.generate_puzzle_with_difficulty(difficulty, max_retries=max_retries)
+
+
+def generate_many(
+        count: int,
+        difficulty: str = "Medium",
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        max_retries: int = 50,
+        library: Optional[str] = None,
+        corpus: Optional[str] = None,
+        **options
+) -> List[Tuple[Board, Dict]]:
+    """
+    批量生成 count 道题目，返回 [(puzzle, info), ...]（顺序与序号一致）。
+
+    第 i 道题使用由 seed 派生出的第 i 个种子单独生成，
+    因此同一个 seed 得到的题目集合与 workers 数无关。
+
+    参数:
+        count: 题目数量
+        difficulty: "Easy" / "Medium" / "Hard"
+        workers: 工作进程数，默认 CPU 核数；<= 1 时在当前进程内生成
+        seed: 主种子；None 表示不可复现
+        max_retries: 每道题的最大尝试次数（同 generate_puzzle_with_difficulty）
+        library: 题目库（SQLite）文件路径；给出时生成结果在一个事务里批量入库
+        corpus: 二进制题库文件路径；给出时把生成的题目按序写成二进制题库（仅 9x9）
+        options: 传给 SudokuGenerator 的其它参数，如 box_size / fast_full
+    """
+    master = random.Random(seed)
+    tasks = [(master.getrandbits(64), difficulty, max_retries, options) for _ in range(count)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or count <= 1:
+        results = [_generate_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_generate_one, tasks, chunksize=max(1, count // (workers * 4))))
+    if library is not None:
+        from src.storage.puzzle_library import PuzzleLibrary
+
+        with PuzzleLibrary(library) as db:
+            db.add_many(results)
+    if corpus is not None:
+        from src.formats.binary_format import write_corpus
+
+        write_corpus(corpus, (puzzle for puzzle, _ in results))
+    return results
+
 # 测试代码
 if __name__ == "__main__":
     gen = SudokuGenerator()
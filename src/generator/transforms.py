@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+数独的等价变换（不改变题目的结构与解的个数）：
+- 数字重新编号（digit_map）
+- 行置换：带（band）之间整体交换 + 带内行交换
+- 列置换：栈（stack）之间整体交换 + 栈内列交换
+- 转置
+
+Transform 记录一次变换，apply 作用于盘面，invert 得到逆变换。
+任意这些操作的组合都能化成 "先转置（可选），再置换行列，再重编号" 的形式。
+minlex / canonical_form 给出等价类的规范代表（用于去重与缓存）。
+"""
+
+import random
+from itertools import groupby, permutations, product
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from src.algorithms.geometry import box_size_of
+
+Board = List[List[int]]
+
+
+class Transform(NamedTuple):
+    row_perm: Tuple[int, ...]  # 新盘面第 r 行取自（转置后）旧盘面第 row_perm[r] 行
+    col_perm: Tuple[int, ...]  # 新盘面第 c 列取自（转置后）旧盘面第 col_perm[c] 列
+    digit_map: Tuple[int, ...]  # 旧数字 v -> 新数字 digit_map[v]，digit_map[0] == 0
+    transpose: bool = False  # 是否先转置
+
+    def apply(self, board: Sequence[Sequence[int]]) -> Board:
+        """返回变换后的新盘面（不修改 board）。"""
+        if self.transpose:
+            board = list(zip(*board))
+        digit_map = self.digit_map
+        col_perm = self.col_perm
+        return [[digit_map[row[c]] for c in col_perm] for row in (board[r] for r in self.row_perm)]
+
+    def invert(self) -> "Transform":
+        """逆变换：inverse.apply(self.apply(board)) == board。"""
+        row_inv = _inverse(self.row_perm)
+        col_inv = _inverse(self.col_perm)
+        digit_inv = _inverse(self.digit_map)
+        if self.transpose:
+            # 转置会交换行与列的角色
+            return Transform(col_inv, row_inv, digit_inv, True)
+        return Transform(row_inv, col_inv, digit_inv, False)
+
+
+def _inverse(perm: Sequence[int]) -> Tuple[int, ...]:
+    inv = [0] * len(perm)
+    for i, p in enumerate(perm):
+        inv[p] = i
+    return tuple(inv)
+
+
+def identity(size: int = 9) -> Transform:
+    """恒等变换。"""
+    return Transform(tuple(range(size)), tuple(range(size)), tuple(range(size + 1)), False)
+
+
+def _line_perm(box_size: int, rng) -> Tuple[int, ...]:
+    """随机的行（或列）置换：带之间整体打乱，带内再各自打乱。"""
+    groups = list(range(box_size))
+    rng.shuffle(groups)
+    perm = []
+    for g in groups:
+        inner = list(range(box_size))
+        rng.shuffle(inner)
+        perm.extend(g * box_size + i for i in inner)
+    return tuple(perm)
+
+
+def random_transform(box_size: int = 3, rng=random) -> Transform:
+    """
+    均匀随机地选一个等价变换。
+    :param rng: random.Random 实例（默认使用全局 random 模块）
+    """
+    n = box_size * box_size
+    digits = list(range(1, n + 1))
+    rng.shuffle(digits)
+    return Transform(
+        _line_perm(box_size, rng),
+        _line_perm(box_size, rng),
+        (0, *digits),
+        rng.random() < 0.5,
+    )
+
+
+def random_isomorph(board: Sequence[Sequence[int]], rng=random) -> Board:
+    """返回 board 的一个随机等价盘面。"""
+    return random_transform(box_size_of(board), rng).apply(board)
+
+
+def minlex(board: Sequence[Sequence[int]]) -> Tuple[str, Transform]:
+    """
+    最小字典序规范形式（minlex）：在全部等价变换（9x9 时为 3,359,232 种行列变换 × 9! 种重编号）
+    得到的盘面中取字典序最小者（空格视为 0，排在所有数字之前）。
+    返回 (规范字符串, 把 board 变成规范盘面的 Transform)。
+
+    不枚举全部变换，而是逐行构造：
+    - 固定行列顺序后，最优的重编号就是 "按首次出现顺序编号"，无需枚举 9!
+    - 第 0 行只与空格 / 已知数的分布有关：栈按已知数个数升序、栈内空格在前，
+      只枚举达到最小分布的列置换
+    - 之后每一行在所有候选状态（转置, 已选行, 列置换, 编号）× 可选的下一行中只保留
+      结果最小（并列）的那些；逐格比较，一旦大于当前最优立即放弃
+    - 同一带内内容完全相同的行、同一栈内内容完全相同的列可以互换而不改变结果，只保留一个
+    """
+    b = box_size_of(board)
+    n = b * b
+    grids = (tuple(tuple(row) for row in board), tuple(zip(*board)))
+
+    # ---------- 第 0 行：只看空格 / 已知数分布 ----------
+    best_pattern = None
+    starts = []  # (t, r)
+    for t, grid in enumerate(grids):
+        for r in _distinct_rows(grid, range(n), b):
+            pattern = _first_row_pattern(grid[r], b)
+            if best_pattern is None or pattern < best_pattern:
+                best_pattern, starts = pattern, [(t, r)]
+            elif pattern == best_pattern:
+                starts.append((t, r))
+
+    states = []  # (t, 已选行, 列置换, 编号, 下一个编号)
+    for t, r in starts:
+        grid = grids[t]
+        columns = tuple(zip(*grid))
+        for col_perm in _first_row_perms(grid[r], columns, b):
+            relabel = {}
+            for c in col_perm:
+                v = grid[r][c]
+                if v:
+                    relabel[v] = len(relabel) + 1
+            states.append((t, (r,), col_perm, relabel, len(relabel) + 1))
+
+    # ---------- 后续各行：保留并列最小的状态 ----------
+    for k in range(1, n):
+        best = None
+        survivors = []
+        for t, rows, col_perm, relabel, next_label in states:
+            grid = grids[t]
+            for r in _next_rows(grid, rows, k, b):
+                row = grid[r]
+                out = []
+                new = {}
+                label = next_label
+                tied = best is not None  # 到目前为止与 best 相同
+                for i, c in enumerate(col_perm):
+                    v = row[c]
+                    if v:
+                        x = relabel.get(v) or new.get(v)
+                        if x is None:
+                            x = new[v] = label
+                            label += 1
+                    else:
+                        x = 0
+                    if tied and x != best[i]:
+                        if x > best[i]:
+                            break
+                        tied = False
+                    out.append(x)
+                else:
+                    key = tuple(out)
+                    if best is None or key < best:
+                        best = key
+                        survivors = []
+                    survivors.append((t, rows + (r,), col_perm, relabel, new, label))
+        states = [(t, rows, col_perm, {**relabel, **new} if new else relabel, label)
+                  for t, rows, col_perm, relabel, new, label in survivors]
+
+    t, rows, col_perm, relabel, next_label = states[0]
+    # 题目中没出现的数字依次编上剩下的号，得到完整的重编号
+    digit_map = [0] * (n + 1)
+    for v in range(1, n + 1):
+        if v not in relabel:
+            relabel[v] = next_label
+            next_label += 1
+        digit_map[v] = relabel[v]
+    transform = Transform(rows, col_perm, tuple(digit_map), bool(t))
+    canonical = transform.apply(board)
+    return "".join(_symbol(v) for row in canonical for v in row), transform
+
+
+def _first_row_pattern(row: Sequence[int], b: int) -> Tuple[int, ...]:
+    """第 0 行能达到的最小空格分布（0 = 空格，1 = 已知数）。"""
+    counts = sorted(sum(1 for v in row[s * b:(s + 1) * b] if v) for s in range(b))
+    return tuple(x for count in counts for x in (0,) * (b - count) + (1,) * count)
+
+
+def _first_row_perms(row: Sequence[int], columns: Sequence[Tuple[int, ...]], b: int) -> Iterator[Tuple[int, ...]]:
+    """使第 0 行达到最小空格分布的全部列置换（内容完全相同的列 / 栈只取一种排法）。"""
+    # 每个栈内：空格列在前、已知数列在后，两组各自任意排列
+    inner = []
+    for s in range(b):
+        cols = range(s * b, (s + 1) * b)
+        empty = [c for c in cols if not row[c]]
+        filled = [c for c in cols if row[c]]
+        orders = {}
+        for e in permutations(empty):
+            for f in permutations(filled):
+                order = e + f
+                orders.setdefault(tuple(columns[c] for c in order), order)
+        inner.append((len(filled), list(orders.values())))
+
+    # 栈按已知数个数升序，个数相同的栈任意排列
+    stacks = sorted(range(b), key=lambda s: inner[s][0])
+    groups = [list(g) for _, g in groupby(stacks, key=lambda s: inner[s][0])]
+    stack_orders = {}
+    for parts in product(*(permutations(g) for g in groups)):
+        order = tuple(s for part in parts for s in part)
+        key = tuple(tuple(sorted(columns[c] for c in range(s * b, (s + 1) * b))) for s in order)
+        stack_orders.setdefault(key, order)
+
+    for order in stack_orders.values():
+        for parts in product(*(inner[s][1] for s in order)):
+            yield tuple(c for part in parts for c in part)
+
+
+def _distinct_rows(grid: Sequence[Tuple[int, ...]], rows: Iterable[int], b: int) -> List[int]:
+    """去掉与同一带内靠前的行内容完全相同的行（互换它们不改变结果）。"""
+    seen = set()
+    result = []
+    for r in rows:
+        key = (r // b, grid[r])
+        if key not in seen:
+            seen.add(key)
+            result.append(r)
+    return result
+
+
+def _next_rows(grid: Sequence[Tuple[int, ...]], rows: Tuple[int, ...], k: int, b: int) -> List[int]:
+    """第 k 行可选的原始行：带的第一行可取任一未用带中的行，否则只能取当前带中剩下的行。"""
+    if k % b == 0:
+        used_bands = {r // b for r in rows}
+        candidates = (r for r in range(b * b) if r // b not in used_bands)
+    else:
+        band = rows[-1] // b
+        candidates = (r for r in range(band * b, (band + 1) * b) if r not in rows)
+    return _distinct_rows(grid, candidates, b)
+
+
+def canonical_form(board: Sequence[Sequence[int]]) -> str:
+    """
+    等价题目的规范字符串（minlex，见 minlex）：空格记为 '.'，行优先拼接。
+    两道题互为等价变换当且仅当规范字符串相同。
+    """
+    return minlex(board)[0]
+
+
+def _symbol(v: int) -> str:
+    """0 -> '.'，1..9 -> '1'..'9'，10 以上依次用 'A'..'Z'（16×16、25×25 盘面）。"""
+    if v == 0:
+        return "."
+    if v < 10:
+        return chr(48 + v)
+    return chr(55 + v)
+
+
+if __name__ == "__main__":
+    base = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+    t = random_transform(rng=random.Random(0))
+    shuffled = t.apply(base)
+    print("变换:", t)
+    print("逆变换还原:", t.invert().apply(shuffled) == base)
+    puzzle = [[v if (r * 9 + c) % 3 else 0 for c, v in enumerate(row)] for r, row in enumerate(base)]
+    print("规范形式一致:", canonical_form(puzzle) == canonical_form(random_isomorph(puzzle)))
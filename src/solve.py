@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+命令行批量求解（不依赖 tkinter / matplotlib）。
+
+从文件或标准输入逐行读取 81 字符的题目（'.' 或 '0' 表示空格），
+边读边解、边解边输出，不会把整个文件读入内存。
+输入文件也可以是二进制题库（formats.binary_format，按文件头自动识别），免去文本解析。
+
+用法（在项目根目录）：
+    python -m src.solve puzzles.txt > solutions.txt
+    cat puzzles.txt | python -m src.solve --algorithm mrv_lcv --workers 4
+    python -m src.solve puzzles.txt --stats > stats.jsonl
+    python -m src.solve puzzles.txt --lockstep --stats > ratings.jsonl
+    python -m src.solve puzzles.bin --lockstep > solutions.txt
+    python -m src.solve --library data/puzzles.sqlite3 --level Hard --clues 24 26 --nodes 400 600
+
+默认每道题输出一行解（无解时输出空行）；--stats 时每道题输出一行 JSON，
+index 为题目在输入中的行号（从 1 开始；二进制题库与题目库为记录序号）。
+格式错误的行不会被跳过：同样输出一行（空行，--stats 时为带 error 字段的 JSON），
+因此按输入顺序输出时，输出的第 k 行对应输入中第 k 道题（空行和 '#' 注释行不计）。
+--library 时改从题目库按条件取题，并把本次的求解统计按算法记回题目库。
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from dataclasses import asdict
+from typing import List, Optional
+
+from src.algorithms.batch_solver import SOLVER_FACTORIES, solve_many
+from src.formats.binary_format import BinaryCorpus, is_binary_corpus
+from src.formats.text_format import format_board, iter_puzzles
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.solve",
+        description="逐行求解 81 字符格式的数独题目")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="题目文件（每行一道题，或二进制题库）；省略或为 '-' 时读取标准输入")
+    parser.add_argument("-o", "--output", default="-",
+                        help="输出文件；省略或为 '-' 时写到标准输出")
+    parser.add_argument("-a", "--algorithm", default="dlx", choices=sorted(SOLVER_FACTORIES),
+                        help="求解算法（默认 dlx）")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="工作进程数（默认 1，即在当前进程内求解）")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="每次发给工作进程的题目数（默认 64）")
+    parser.add_argument("--unordered", action="store_true",
+                        help="按完成顺序输出（多进程时吞吐更高；用 --stats 的 index 对应回输入行）")
+    parser.add_argument("--cache", type=int, default=0, metavar="N",
+                        help="每个工作进程各自缓存最近 N 道题的解（默认不缓存）；多进程时重复的题目"
+                             "只有分到同一个进程才会命中。不能与 --lockstep 同用")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="先用 NumPy 对整批题目齐步做约束传播，只回溯剩下的题（需要 numpy）；"
+                             "在当前进程内按输入顺序求解，不能与 --workers / --unordered / --cache 同用，"
+                             "每批至少 1024 道题（--chunksize 小于 1024 时按 1024）")
+    parser.add_argument("--stats", action="store_true",
+                        help="每道题输出一行 JSON（JSONL），包含输入行号 index、解与统计信息")
+    library = parser.add_argument_group("题目库", "从 SQLite 题目库取题（代替 input），求解统计按算法记回题目库")
+    library.add_argument("--library", metavar="DB", help="题目库文件")
+    library.add_argument("--level", choices=["Easy", "Medium", "Hard"], help="难度")
+    library.add_argument("--clues", type=int, nargs=2, metavar=("MIN", "MAX"), default=(None, None),
+                         help="提示数范围（闭区间）")
+    library.add_argument("--nodes", type=int, nargs=2, metavar=("MIN", "MAX"), default=(None, None),
+                         help="评级节点数范围（闭区间）")
+    library.add_argument("--limit", type=int, help="最多取的题目数")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.lockstep and args.workers > 1:
+        parser.error("--lockstep 在当前进程内求解，不能与 --workers 同用")
+    if args.lockstep and args.unordered:
+        parser.error("--lockstep 按输入顺序输出，不能与 --unordered 同用")
+    if args.lockstep and args.cache:
+        parser.error("--lockstep 不使用解缓存，不能与 --cache 同用")
+
+    line_of = None  # 文本输入时：题目序号 -> 输入行号，输出后即删除
+    bad_lines = deque()  # 尚未输出的格式错误行 (行号, 错误信息)，按行号递增
+
+    def report(line_no: int, message: str) -> None:
+        print(f"第 {line_no} 行格式错误: {message}", file=sys.stderr)
+        bad_lines.append((line_no, message))
+
+    library = records = None
+    if args.library is not None:
+        if args.input != "-":
+            parser.error("--library 与 input 不能同时使用")
+        from src.storage.puzzle_library import PuzzleLibrary
+        library = PuzzleLibrary(args.library)
+        records = library.query(args.level, tuple(args.clues), tuple(args.nodes), args.limit)
+        src = None
+        puzzles = (record.board for record in records)
+    elif args.input != "-" and is_binary_corpus(args.input):
+        # 二进制题库：mmap 读取，齐步模式下整块解码为数组
+        src = BinaryCorpus(args.input)
+        puzzles = src
+    else:
+        src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+        line_of = {}
+
+        def numbered():
+            # 生成器按需读取，solve_many 每次只取走一个分块
+            for i, (line_no, board) in enumerate(iter_puzzles(src, on_error=report)):
+                line_of[i] = line_no
+                yield board
+
+        puzzles = numbered()
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    algorithm = f"lockstep+{args.algorithm}" if args.lockstep else args.algorithm
+    solved_stats = []  # 题目库模式下记回的 (puzzle_id, 算法名, SolveStats)
+    unsolved = malformed = 0
+    ordered = not args.unordered
+
+    def write_bad_lines(before: Optional[int] = None) -> None:
+        """输出行号小于 before 的格式错误行（before 为 None 时全部输出）。"""
+        nonlocal malformed
+        while bad_lines and (before is None or bad_lines[0][0] < before):
+            line_no, message = bad_lines.popleft()
+            malformed += 1
+            if args.stats:
+                record = {"index": line_no, "solution": None, "error": message}
+                dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                dst.write("\n")
+
+    if args.lockstep:
+        from src.algorithms.lockstep_solver import solve_lockstep
+        results = solve_lockstep(puzzles, algorithm=args.algorithm, chunksize=max(args.chunksize, 1024))
+    else:
+        results = solve_many(puzzles, algorithm=args.algorithm, workers=args.workers,
+                             chunksize=args.chunksize, ordered=ordered, cache_size=args.cache)
+    try:
+        for result in results:
+            index = result.index if line_of is None else line_of.pop(result.index)
+            # 按输入顺序输出时，排在这道题之前的格式错误行先输出
+            write_bad_lines(index if ordered else None)
+            solution = format_board(result.solution) if result.solution else None
+            if solution is None:
+                unsolved += 1
+            if records is not None:
+                solved_stats.append((records[result.index]["id"], algorithm, result.stats))
+            if args.stats:
+                record = {"index": index, "solution": solution}
+                record.update(asdict(result.stats))
+                dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                dst.write((solution or "") + "\n")
+        write_bad_lines()
+    except BrokenPipeError:
+        # 下游（如 head）提前关闭了管道：停止输出，避免退出时再次报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if src is not None and src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+        if library is not None:
+            library.record_stats(solved_stats)
+            library.close()
+
+    if malformed:
+        print(f"{malformed} 行格式错误", file=sys.stderr)
+    if unsolved:
+        print(f"{unsolved} 道题无解", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
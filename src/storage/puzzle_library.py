@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+基于 SQLite 的题目库：保存已评级的题目，按难度 / 提示数 / 节点数建索引。
+
+表结构：
+    puzzles      每道题一行：题目（81 字符）、规范形式、提示数、评级、节点数、回溯数
+    solve_stats  每道题每种算法一行：节点数、回溯数、求解时间
+
+- add_many 在一个事务里批量插入，已存在的题目（按题目字符串去重）会被跳过
+- query 支持 "Hard、提示数 24-26、节点数 400-600" 这样的范围查询，走 (level, clues, nodes) 索引
+- canonical 列是 minlex 规范形式（transforms.canonical_form），isomorphs 按它查找等价题目
+
+命令行（在项目根目录）：
+    python -m src.storage.puzzle_library import puzzles.txt     # 逐行评级后入库
+    python -m src.storage.puzzle_library query --level Hard --clues 24 26 --nodes 400 600
+    python -m src.storage.puzzle_library status
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.formats.text_format import format_board, iter_puzzles, parse_puzzle
+from src.generator.transforms import canonical_form
+
+Board = List[List[int]]
+Range = Tuple[Optional[int], Optional[int]]  # 闭区间，None 表示不限
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "data", "puzzles.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id          INTEGER PRIMARY KEY,
+    puzzle      TEXT NOT NULL UNIQUE,
+    canonical   TEXT NOT NULL,
+    clues       INTEGER NOT NULL,
+    level       TEXT NOT NULL,
+    nodes       INTEGER NOT NULL,
+    backtracks  INTEGER NOT NULL,
+    created_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_puzzles_level_clues_nodes ON puzzles (level, clues, nodes);
+CREATE INDEX IF NOT EXISTS idx_puzzles_canonical ON puzzles (canonical);
+CREATE TABLE IF NOT EXISTS solve_stats (
+    puzzle_id   INTEGER NOT NULL REFERENCES puzzles (id) ON DELETE CASCADE,
+    algorithm   TEXT NOT NULL,
+    nodes       INTEGER NOT NULL,
+    backtracks  INTEGER NOT NULL,
+    solve_time  REAL NOT NULL,
+    PRIMARY KEY (puzzle_id, algorithm)
+);
+"""
+
+
+class PuzzleRecord(Dict[str, Any]):
+    """查询结果：id / puzzle / canonical / clues / level / nodes / backtracks。"""
+
+    @property
+    def board(self) -> Board:
+        return parse_puzzle(self["puzzle"])
+
+    @property
+    def info(self) -> Dict:
+        """与 generate_puzzle_with_difficulty 返回的 info 相同的格式。"""
+        return {"level": self["level"], "clues": self["clues"],
+                "stats": {"nodes": self["nodes"], "backtracks": self["backtracks"]}}
+
+
+class PuzzleLibrary:
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        # UI 在后台线程里读写，连接允许跨线程使用（sqlite3 自身串行化访问）
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PuzzleLibrary":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------- 写入 ----------
+
+    @staticmethod
+    def _row(puzzle: Board, info: Dict) -> Tuple:
+        if len(puzzle) != 9:
+            raise ValueError("题目库只保存 9x9 题目")
+        stats = info["stats"]
+        return (format_board(puzzle), canonical_form(puzzle), info["clues"], info["level"],
+                stats["nodes"], stats["backtracks"], time.time())
+
+    def add(self, puzzle: Board, info: Dict) -> int:
+        """插入一道题（info 格式同 generate_puzzle_with_difficulty），返回其 id；已存在时返回原 id。"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO puzzles (puzzle, canonical, clues, level, nodes, backtracks, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", self._row(puzzle, info))
+        return self.conn.execute("SELECT id FROM puzzles WHERE puzzle = ?",
+                                 (format_board(puzzle),)).fetchone()[0]
+
+    def add_many(self, items: Iterable[Tuple[Board, Dict]]) -> int:
+        """在一个事务里批量插入 (puzzle, info)，返回新插入的题目数。"""
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO puzzles (puzzle, canonical, clues, level, nodes, backtracks, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", (self._row(puzzle, info) for puzzle, info in items))
+            return self.conn.total_changes - before
+
+    def record_stats(self, items: Iterable[Tuple[int, str, Any]]) -> None:
+        """
+        批量记录求解统计：items 为 (puzzle_id, 算法名, SolveStats)，
+        同一题同一算法重复记录时覆盖旧值。
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO solve_stats (puzzle_id, algorithm, nodes, backtracks, solve_time)"
+                " VALUES (?, ?, ?, ?, ?)",
+                ((pid, algorithm, stats.nodes, stats.backtracks, stats.pure_solve_time)
+                 for pid, algorithm, stats in items))
+
+    # ---------- 查询 ----------
+
+    def query(self, level: Optional[str] = None, clues: Range = (None, None), nodes: Range = (None, None),
+              limit: Optional[int] = None, shuffle: bool = False) -> List[PuzzleRecord]:
+        """
+        范围查询，例如 query("Hard", clues=(24, 26), nodes=(400, 600))。
+        shuffle=True 时随机顺序返回（配合 limit 随机抽题）。
+        """
+        conditions, params = [], []
+        if level is not None:
+            conditions.append("level = ?")
+            params.append(level)
+        for column, (low, high) in (("clues", clues), ("nodes", nodes)):
+            if low is not None:
+                conditions.append(f"{column} >= ?")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{column} <= ?")
+                params.append(high)
+        sql = "SELECT id, puzzle, canonical, clues, level, nodes, backtracks FROM puzzles"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY random()" if shuffle else " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [PuzzleRecord(row) for row in self.conn.execute(sql, params)]
+
+    def isomorphs(self, puzzle: Board) -> List[PuzzleRecord]:
+        """库中与 puzzle 等价（规范形式相同）的题目，包括 puzzle 本身。"""
+        rows = self.conn.execute(
+            "SELECT id, puzzle, canonical, clues, level, nodes, backtracks FROM puzzles"
+            " WHERE canonical = ? ORDER BY id", (canonical_form(puzzle),))
+        return [PuzzleRecord(row) for row in rows]
+
+    def random_puzzle(self, level: str) -> Optional[PuzzleRecord]:
+        """随机取一道指定难度的题；没有时返回 None。"""
+        records = self.query(level, limit=1, shuffle=True)
+        return records[0] if records else None
+
+    def solve_stats(self, puzzle_id: int) -> Dict[str, Dict]:
+        """某道题各算法的求解统计：{算法名: {"nodes", "backtracks", "solve_time"}}。"""
+        rows = self.conn.execute(
+            "SELECT algorithm, nodes, backtracks, solve_time FROM solve_stats WHERE puzzle_id = ?",
+            (puzzle_id,))
+        return {row["algorithm"]: {"nodes": row["nodes"], "backtracks": row["backtracks"],
+                                   "solve_time": row["solve_time"]} for row in rows}
+
+    def count(self, level: Optional[str] = None) -> int:
+        if level is None:
+            return self.conn.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM puzzles WHERE level = ?", (level,)).fetchone()[0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.storage.puzzle_library",
+                                     description="SQLite 题目库")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="数据库文件")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="逐行评级后批量入库")
+    importer.add_argument("input", help="题目文件，每行 81 字符")
+
+    query = commands.add_parser("query", help="按难度 / 提示数 / 节点数查询，输出 81 字符题目")
+    query.add_argument("--level", choices=["Easy", "Medium", "Hard"])
+    query.add_argument("--clues", type=int, nargs=2, metavar=("MIN", "MAX"), default=(None, None))
+    query.add_argument("--nodes", type=int, nargs=2, metavar=("MIN", "MAX"), default=(None, None))
+    query.add_argument("--limit", type=int)
+
+    commands.add_parser("status", help="各难度的题目数")
+    args = parser.parse_args(argv)
+
+    with PuzzleLibrary(args.db) as library:
+        if args.command == "import":
+            from src.generator.sudoku_generator import SudokuGenerator
+
+            generator = SudokuGenerator(verbose=False)
+
+            def report(line_no: int, message: str) -> None:
+                print(f"跳过第 {line_no} 行: {message}", file=sys.stderr)
+
+            def rated(lines):
+                for _, board in iter_puzzles(lines, on_error=report):
+                    level, stats = generator.evaluate_difficulty(board)
+                    if level != "Invalid":
+                        yield board, {"level": level, "stats": stats, "clues": generator._count_clues(board)}
+
+            with open(args.input, "r", encoding="utf-8") as f:
+                added = library.add_many(rated(f))
+            print(f"新增 {added} 道题，共 {library.count()} 道", file=sys.stderr)
+        elif args.command == "query":
+            for record in library.query(args.level, tuple(args.clues), tuple(args.nodes), args.limit):
+                print(record["puzzle"])
+        else:
+            for level in ("Easy", "Medium", "Hard"):
+                print(f"{level}: {library.count(level)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+生成器测试脚本
+验证 use_propagation 在默认的增量唯一性判断（incremental=True）下同样生效：
+同一种子生成的题目不变，唯一性判断的搜索节点数减少
+
+用法（在项目根目录）：
+    python test_generator.py
+"""
+
+import sys
+
+from src.algorithms.solution_counter import SolutionCounter
+from src.generator.sudoku_generator import SudokuGenerator
+
+SEED = 1
+PUZZLES = 5
+TARGET_CLUES = 24
+
+
+class TallyCounter(SolutionCounter):
+    """累计 has_other_solution 的调用次数与搜索节点数。"""
+
+    def __init__(self, box_size=3):
+        super().__init__(box_size)
+        self.calls = 0
+        self.total_nodes = 0
+
+    def has_other_solution(self, board, solution, cells):
+        found = super().has_other_solution(board, solution, cells)
+        self.calls += 1
+        self.total_nodes += self.stats.nodes
+        return found
+
+
+def _generate(use_propagation):
+    """按固定种子生成题目，返回 (题目列表, 计数器)。"""
+    generator = SudokuGenerator(seed=SEED, use_propagation=use_propagation, verbose=False)
+    assert generator.incremental
+    counter = generator._counter = TallyCounter(generator.box_size)
+    puzzles = [generator.generate_puzzle(target_clues=TARGET_CLUES) for _ in range(PUZZLES)]
+    return puzzles, counter
+
+
+def test_propagation_applies_to_incremental_check():
+    plain_puzzles, plain = _generate(use_propagation=False)
+    prop_puzzles, prop = _generate(use_propagation=True)
+    # 传播只会缩小搜索，不改变唯一性判断的结论
+    assert prop_puzzles == plain_puzzles
+    assert prop.total_nodes < plain.total_nodes, (prop.total_nodes, plain.total_nodes)
+    print(f"   ✓ 节点数 {plain.total_nodes} -> {prop.total_nodes}，"
+          f"计数器调用 {plain.calls} -> {prop.calls}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("生成器 - 约束传播测试")
+    print("=" * 60)
+    try:
+        test_propagation_applies_to_incremental_check()
+    except AssertionError as e:
+        print(f"   ✗ 失败: {e!r}")
+        sys.exit(1)
+    print("全部通过")
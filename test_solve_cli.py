@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+命令行求解（python -m src.solve）测试脚本
+验证已知数互相冲突的题目对每种算法都输出空行，且不会卡住后面的题目；
+格式错误的行同样占一行输出，--stats 的 index 为输入行号
+
+用法（在项目根目录）：
+    python test_solve_cli.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from src.algorithms.batch_solver import SOLVER_FACTORIES
+
+# 第一行：第 1 行出现两个 1（无解）；第二行：正常题目
+INVALID = "11" + "." * 79
+VALID = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+SOLUTION = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+MALFORMED = "12345"  # 长度不对，无法解析
+TIMEOUT = 60  # 单次运行的超时（秒）
+
+
+def _run(path, *args):
+    """运行命令行求解，返回输出的各行。"""
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.solve", path, *args],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, timeout=TIMEOUT)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.splitlines()
+
+
+def test_invalid_puzzle_gives_empty_line():
+    modes = [[]]
+    try:
+        import numpy  # noqa: F401
+        modes.append(["--lockstep"])
+    except ImportError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "puzzles.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(INVALID + "\n" + VALID + "\n")
+        for algorithm in sorted(SOLVER_FACTORIES):
+            for mode in modes:
+                lines = _run(path, "-a", algorithm, *mode)
+                assert lines == ["", SOLUTION], (algorithm, mode, lines)
+                print(f"   ✓ -a {algorithm} {' '.join(mode)}".rstrip())
+
+
+def test_malformed_line_keeps_alignment():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "puzzles.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# 注释\n" + MALFORMED + "\n" + VALID + "\n" + MALFORMED + "\n")
+        for mode in ([], ["--workers", "2"]):
+            lines = _run(path, *mode)
+            assert lines == ["", SOLUTION, ""], (mode, lines)
+            records = [json.loads(line) for line in _run(path, "--stats", *mode)]
+            assert [(r["index"], r["solution"]) for r in records] == [(2, None), (3, SOLUTION), (4, None)], records
+            assert "error" in records[0] and "error" not in records[1], records
+            print(f"   ✓ 格式错误的行 {' '.join(mode)}".rstrip())
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("命令行求解 - 无效题目与格式错误测试")
+    print("=" * 60)
+    try:
+        test_invalid_puzzle_gives_empty_line()
+        test_malformed_line_keeps_alignment()
+    except (AssertionError, subprocess.TimeoutExpired) as e:
+        print(f"   ✗ 失败: {e!r}")
+        sys.exit(1)
+    print("全部通过")